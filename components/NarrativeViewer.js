@@ -198,13 +198,8 @@ export class NarrativeViewer {
    * @private
    */
   _getPartAudioFile(partIndex) {
-    // Check if audio metadata is loaded globally
-    if (typeof window.audioMetadata === 'undefined') return null;
-
-    const narrativeAudio = window.audioMetadata.narratives?.[this.data.verb];
-    if (!narrativeAudio) return null;
-
-    const partAudio = narrativeAudio.parts?.[partIndex];
+    // Narrative clips come with the synonym from data/bundle.json
+    const partAudio = this.data.audio?.narrative?.[partIndex];
     return partAudio ? partAudio.file : null;
   }
 
@@ -297,8 +292,9 @@ export class NarrativeViewer {
       this._updateAudioControls(this.currentPlayingPart, 'stopped');
     }
 
-    // Create new audio
-    this.currentAudio = new Audio(audioFile);
+    // Create new audio, in the smallest format the browser supports
+    const source = window.pickAudioSource ? window.pickAudioSource(audioFile) : audioFile;
+    this.currentAudio = new Audio(source);
     this.currentPlayingPart = partIndex;
 
     // Update UI to show pause button
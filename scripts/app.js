@@ -3,65 +3,224 @@
  * Uses local images (no API calls needed)
  */
 
-// Load image credits and audio metadata
-let imageCredits = {};
-let audioMetadata = {};
-window.audioMetadata = {}; // Make globally accessible for NarrativeViewer
+// Synonyms joined with their image credit and audio, keyed by verb
+let verbsByName = {};
+let heroImagePath = 'assets/images/hero/hero.jpg';
 
 // Load synonyms data
 let synonymsData = [];
 let filteredSynonyms = [];
 
+// Folded search index from scripts/search_index.py, fetched after the first render
+let searchIndexLoading = null;
+
+// Facet bitsets from scripts/facet_index.py, fetched after the first render
+let facetsLoading = null;
+
+// Filter select of each facet in data/facets.json
+const FACET_FILTERS = {
+    formality: 'formality-filter',
+    regions: 'region-filter',
+    context: 'context-filter'
+};
+
 // Audio playback state
 let currentAudio = null;
 
+// Audio sprites: clip file -> { file, start, duration } in seconds
+let spriteClips = {};
+const spriteAudio = {};
+
+// Encoded variants: MP3 file -> sources, smallest first
+let audioSources = {};
+const audioProbe = document.createElement('audio');
+
 // Initialize app when DOM is loaded
 document.addEventListener('DOMContentLoaded', async () => {
     await loadData();
     setupEventListeners();
     renderCards(synonymsData);
+    loadSearchIndex();
+    loadFacets();
     loadHeroImage();
+    registerServiceWorker();
 });
 
-// Load JSON data
-async function loadData() {
-    try {
-        // Load synonyms
-        const synonymsResponse = await fetch('data/synonyms.json');
-        synonymsData = await synonymsResponse.json();
-        filteredSynonyms = [...synonymsData];
+// Precache the site for offline use, in the audio formats this browser plays
+function registerServiceWorker() {
+    if (!('serviceWorker' in navigator) || !location.protocol.startsWith('http')) return;
 
-        // Load image credits
-        try {
-            const creditsResponse = await fetch('data/image_credits.json');
-            imageCredits = await creditsResponse.json();
-        } catch (err) {
-            console.log('Image credits not available');
-        }
+    const types = new Set(['audio/mpeg']);
+    Object.values(audioSources).forEach(sources => sources.forEach(source => types.add(source.type)));
+    const playable = [...types].filter(type => audioProbe.canPlayType(type) !== '');
 
-        // Load audio metadata
-        try {
-            const audioResponse = await fetch('data/audio_metadata.json');
-            audioMetadata = await audioResponse.json();
-            window.audioMetadata = audioMetadata; // Make globally accessible
-            console.log('✅ Audio metadata loaded:', Object.keys(audioMetadata));
-        } catch (err) {
-            console.log('Audio not available');
-        }
+    navigator.serviceWorker.register(`sw.js?audio=${encodeURIComponent(playable.join(','))}`)
+        .catch(err => console.log('Service worker not registered:', err));
+}
 
+// Load JSON data: the card index pre-joined by scripts/data_bundle.py
+async function loadData() {
+    try {
+        const bundleResponse = await fetch('data/bundle.json');
+        const bundle = await bundleResponse.json();
+        verbsByName = bundle.verbs;
+        heroImagePath = bundle.hero || heroImagePath;
+        synonymsData = Object.values(verbsByName);
+        filteredSynonyms = [...synonymsData];
+        synonymsData.forEach(synonym => {
+            indexAudioSources(synonym.audio);
+            // The verb clip plays from its (precached) sprite before the shard loads
+            if (synonym.sprite) indexSprite(synonym.sprite);
+        });
     } catch (error) {
         console.error('Error loading data:', error);
         // Fallback to empty array
+        verbsByName = {};
         synonymsData = [];
         filteredSynonyms = [];
     }
 }
 
+// Fetch the search index once; resolves to null if it is unavailable
+function loadSearchIndex() {
+    searchIndexLoading = searchIndexLoading || fetch('data/search_index.json')
+        .then(response => response.json())
+        .catch(err => {
+            console.log('Search index not available');
+            return null;
+        });
+    return searchIndexLoading;
+}
+
+// Lowercase without accents, as scripts/search_index.py folds the index
+function foldText(text) {
+    return text.normalize('NFD').replace(/[\u0300-\u036f]/g, '').toLowerCase();
+}
+
+// Position of the first token not sorting before prefix
+function lowerBound(tokens, prefix) {
+    let low = 0;
+    let high = tokens.length;
+    while (low < high) {
+        const mid = (low + high) >> 1;
+        if (tokens[mid] < prefix) low = mid + 1;
+        else high = mid;
+    }
+    return low;
+}
+
+// Verbs with a word starting with each word of the query
+function searchVerbs(index, query) {
+    let matches = null;
+    for (const word of foldText(query).match(/[\p{L}\p{N}]+/gu) || []) {
+        const ids = new Set();
+        for (let i = lowerBound(index.tokens, word);
+             i < index.tokens.length && index.tokens[i].startsWith(word); i++) {
+            index.postings[i].forEach(id => ids.add(id));
+        }
+        matches = matches ? new Set([...matches].filter(id => ids.has(id))) : ids;
+        if (matches.size === 0) break;
+    }
+    return new Set([...(matches || [])].map(id => index.verbs[id]));
+}
+
+// Verbs matching the search query, scanning the data only without an index
+async function searchMatches(query) {
+    const index = await loadSearchIndex();
+    if (index) return searchVerbs(index, query);
+
+    const folded = foldText(query);
+    return new Set(synonymsData
+        .filter(synonym => [synonym.verb, synonym.definition, synonym.quickDefinition]
+            .some(text => text && foldText(text).includes(folded)))
+        .map(synonym => synonym.verb));
+}
+
+// Fetch the facet bitsets once and show their counts; resolves to null if unavailable
+function loadFacets() {
+    facetsLoading = facetsLoading || fetch('data/facets.json')
+        .then(response => response.json())
+        .then(facets => {
+            showFacetCounts(facets);
+            return facets;
+        })
+        .catch(err => {
+            console.log('Facets not available');
+            return null;
+        });
+    return facetsLoading;
+}
+
+// List every facet value in its select, labelled with its precomputed count
+function showFacetCounts(facets) {
+    Object.entries(FACET_FILTERS).forEach(([name, id]) => {
+        const select = document.getElementById(id);
+        if (!select) return;
+        Object.entries(facets.facets[name] || {}).forEach(([value, { count }]) => {
+            let option = [...select.options].find(option => option.value === value);
+            if (!option) {
+                option = new Option(value.charAt(0).toUpperCase() + value.slice(1), value);
+                select.add(option);
+            }
+            option.textContent = `${option.textContent} (${count})`;
+        });
+    });
+}
+
+// Values chosen in each filter, leaving out filters set to "all"
+function selectedFacets() {
+    const selected = {};
+    Object.entries(FACET_FILTERS).forEach(([name, id]) => {
+        const select = document.getElementById(id);
+        const values = select ? [...select.selectedOptions]
+            .map(option => option.value)
+            .filter(value => value !== 'all') : [];
+        if (values.length) selected[name] = values;
+    });
+    return selected;
+}
+
+// Ids having any chosen value (OR) of every filtered facet (AND), or null if none is filtered
+function facetMatches(facets, selected) {
+    let bits = null;
+    Object.entries(selected).forEach(([name, values]) => {
+        const union = new Uint32Array(Math.ceil(facets.size / 32));
+        values.forEach(value => (facets.facets[name]?.[value]?.bits || [])
+            .forEach((word, i) => { union[i] |= word; }));
+        bits = bits ? bits.map((word, i) => word & union[i]) : union;
+    });
+    return bits;
+}
+
+function hasBit(bits, id) {
+    return ((bits[id >> 5] >>> (id & 31)) & 1) === 1;
+}
+
+// Fetch a synonym's detail shard the first time one of its views opens
+function loadDetails(synonym) {
+    if (!synonym.detail) return Promise.resolve(synonym);
+    synonym.detailLoading = synonym.detailLoading || fetch(synonym.detail)
+        .then(response => response.json())
+        .then(({ audio, sprite, ...details }) => {
+            Object.assign(synonym, details);
+            synonym.audio = { ...synonym.audio, ...audio };
+            indexAudioSources(audio);
+            if (sprite) indexSprite(sprite);
+            return synonym;
+        })
+        .catch(error => {
+            console.error('Error loading details:', error);
+            synonym.detailLoading = null;  // try again next time
+            return synonym;
+        });
+    return synonym.detailLoading;
+}
+
 // Load hero image
 function loadHeroImage() {
     const heroImage = document.getElementById('hero-image');
     if (heroImage) {
-        heroImage.src = 'assets/images/hero/hero.jpg';
+        heroImage.src = heroImagePath;
         heroImage.alt = 'Ver el mundo - Sinónimos en español';
     }
 }
@@ -75,11 +234,10 @@ function setupEventListeners() {
     }
 
     // Filters
-    const formalityFilter = document.getElementById('formality-filter');
-    const contextFilter = document.getElementById('context-filter');
-
-    if (formalityFilter) formalityFilter.addEventListener('change', applyFilters);
-    if (contextFilter) contextFilter.addEventListener('change', applyFilters);
+    Object.values(FACET_FILTERS).forEach(id => {
+        const select = document.getElementById(id);
+        if (select) select.addEventListener('change', applyFilters);
+    });
 
     // Reset button
     const resetButton = document.getElementById('reset-filters');
@@ -101,34 +259,27 @@ function handleSearch(e) {
 }
 
 // Apply filters
-function applyFilters() {
+async function applyFilters() {
     const searchInput = document.getElementById('search-input');
-    const formalityFilter = document.getElementById('formality-filter');
-    const contextFilter = document.getElementById('context-filter');
+    const query = searchInput ? searchInput.value.trim() : '';
+    const selected = selectedFacets();
 
-    const query = searchInput ? searchInput.value.toLowerCase().trim() : '';
-    const formality = formalityFilter ? formalityFilter.value : 'all';
-    const context = contextFilter ? contextFilter.value : 'all';
+    const [matches, facets] = await Promise.all([query ? searchMatches(query) : null, loadFacets()]);
+    const bits = facets ? facetMatches(facets, selected) : null;
 
-    filteredSynonyms = synonymsData.filter(synonym => {
+    // Ids are positions in synonyms.json, the order synonymsData keeps
+    filteredSynonyms = synonymsData.filter((synonym, id) => {
         // Search filter
-        if (query && !synonym.verb.toLowerCase().includes(query) &&
-            !synonym.definition.toLowerCase().includes(query) &&
-            !synonym.quickDefinition.toLowerCase().includes(query)) {
+        if (matches && !matches.has(synonym.verb)) {
             return false;
         }
 
-        // Formality filter
-        if (formality !== 'all' && synonym.formality !== formality) {
-            return false;
-        }
-
-        // Context filter
-        if (context !== 'all' && synonym.context !== context) {
-            return false;
+        // Facet filters
+        if (bits) {
+            return hasBit(bits, id);
         }
-
-        return true;
+        return Object.entries(selected).every(([name, values]) =>
+            [].concat(synonym[name]).some(value => values.includes(value)));
     });
 
     renderCards(filteredSynonyms);
@@ -137,12 +288,11 @@ function applyFilters() {
 // Reset filters
 function resetFilters() {
     const searchInput = document.getElementById('search-input');
-    const formalityFilter = document.getElementById('formality-filter');
-    const contextFilter = document.getElementById('context-filter');
-
     if (searchInput) searchInput.value = '';
-    if (formalityFilter) formalityFilter.value = 'all';
-    if (contextFilter) contextFilter.value = 'all';
+    Object.values(FACET_FILTERS).forEach(id => {
+        const select = document.getElementById(id);
+        if (select) select.value = 'all';
+    });
 
     filteredSynonyms = [...synonymsData];
     renderCards(filteredSynonyms);
@@ -182,9 +332,8 @@ function createCard(synonym, index) {
         }
     };
 
-    const verbKey = synonym.verb;
-    const credit = imageCredits?.images?.[verbKey];
-    const hasNarrative = synonym.narrativeExperience && synonym.narrativeExperience.title;
+    const credit = synonym.credit;
+    const hasNarrative = synonym.hasNarrative;
 
     card.innerHTML = `
         <div class="card-image-container">
@@ -242,7 +391,7 @@ function createTag(text, type) {
 
 // Create audio button
 function createAudioButton(verb, type) {
-    const audioFile = audioMetadata?.verbs?.[verb]?.file;
+    const audioFile = verbsByName[verb]?.audio?.verb?.file;
     if (!audioFile) return '';
 
     return `
@@ -259,19 +408,63 @@ function createAudioButton(verb, type) {
     `;
 }
 
+// Map every clip packed into a verb's sprite to its position in the sprite
+function indexSprite(sprite) {
+    sprite.clips.forEach((clip, i) => {
+        spriteClips[clip] = {
+            file: sprite.file,
+            start: sprite.start[i] / 1000,
+            duration: sprite.duration[i] / 1000
+        };
+    });
+    if (sprite.sources) {
+        audioSources[sprite.file] = sprite.sources;
+    }
+}
+
+// Map every clip of a verb with encoded variants to its sources list
+function indexAudioSources(audio) {
+    const add = entry => {
+        if (entry?.sources) {
+            audioSources[entry.file] = entry.sources;
+        }
+    };
+    add(audio?.verb);
+    (audio?.examples || []).forEach(add);
+    (audio?.narrative || []).forEach(add);
+}
+
+// Smallest encoding of an MP3 the browser can play, or the MP3 itself
+function pickAudioSource(audioFile) {
+    const sources = audioSources[audioFile];
+    if (!sources) return audioFile;
+    const playable = sources.find(source => audioProbe.canPlayType(source.type) !== '');
+    return playable ? playable.file : audioFile;
+}
+
 // Play audio file
 function playAudio(audioFile, buttonElement) {
     // Stop any currently playing audio
     if (currentAudio) {
         currentAudio.pause();
         currentAudio.currentTime = 0;
+        currentAudio.ontimeupdate = null;
         // Remove playing class from all buttons
         document.querySelectorAll('.audio-button.playing, .example-audio-button.playing')
             .forEach(btn => btn.classList.remove('playing'));
     }
 
-    // Create and play new audio
-    currentAudio = new Audio(audioFile);
+    // Clips packed into a sprite seek into one shared, already-loaded file
+    const spriteClip = spriteClips[audioFile];
+    if (spriteClip) {
+        spriteAudio[spriteClip.file] = spriteAudio[spriteClip.file] ||
+            new Audio(pickAudioSource(spriteClip.file));
+        currentAudio = spriteAudio[spriteClip.file];
+        currentAudio.currentTime = spriteClip.start;
+    } else {
+        currentAudio = new Audio(pickAudioSource(audioFile));
+    }
+    const audio = currentAudio;
 
     // Add playing class
     if (buttonElement) {
@@ -279,13 +472,26 @@ function playAudio(audioFile, buttonElement) {
     }
 
     // Remove playing class when done
-    currentAudio.onended = () => {
+    audio.onended = () => {
         if (buttonElement) {
             buttonElement.classList.remove('playing');
         }
-        currentAudio = null;
+        audio.ontimeupdate = null;
+        if (currentAudio === audio) {
+            currentAudio = null;
+        }
     };
 
+    // Sprite clips end at their own duration, not at the end of the file
+    if (spriteClip) {
+        audio.ontimeupdate = () => {
+            if (audio.currentTime >= spriteClip.start + spriteClip.duration) {
+                audio.pause();
+                audio.onended();
+            }
+        };
+    }
+
     // Play
     currentAudio.play().catch(err => {
         console.error('Audio playback failed:', err);
@@ -297,12 +503,15 @@ function playAudio(audioFile, buttonElement) {
 
 // Make playAudio globally available
 window.playAudio = playAudio;
+window.pickAudioSource = pickAudioSource;
 
 // Open detail modal
-function openModal(synonym) {
+async function openModal(synonym) {
     const modal = document.getElementById('detail-modal');
     if (!modal) return;
 
+    await loadDetails(synonym);
+
     // Populate modal content
     document.getElementById('modal-verb').textContent = synonym.verb;
 
@@ -314,7 +523,7 @@ function openModal(synonym) {
         modalPronText.textContent = synonym.pronunciation;
     }
 
-    document.getElementById('modal-definition').textContent = synonym.definition;
+    document.getElementById('modal-definition').textContent = synonym.definition || '';
 
     // Image
     const modalImage = document.getElementById('modal-image');
@@ -324,8 +533,7 @@ function openModal(synonym) {
     }
 
     // Image credit
-    const verbKey = synonym.verb;
-    const credit = imageCredits?.images?.[verbKey];
+    const credit = synonym.credit;
     const creditElement = document.getElementById('modal-image-credit');
     if (creditElement && credit) {
         creditElement.innerHTML = `
@@ -346,8 +554,8 @@ function openModal(synonym) {
     // Examples with audio
     const examplesList = document.getElementById('modal-examples');
     if (examplesList) {
-        const examplesAudio = audioMetadata?.examples?.[synonym.verb] || [];
-        examplesList.innerHTML = synonym.examples
+        const examplesAudio = synonym.audio?.examples || [];
+        examplesList.innerHTML = (synonym.examples || [])
             .map((example, i) => {
                 const audioFile = examplesAudio[i]?.file;
                 const audioButton = audioFile ? `
@@ -409,7 +617,8 @@ function scrollToContent() {
 async function openNarrative(verb, event) {
     if (event) event.stopPropagation();
 
-    const synonym = synonymsData.find(s => s.verb === verb);
+    const synonym = verbsByName[verb];
+    if (synonym) await loadDetails(synonym);
     if (!synonym || !synonym.narrativeExperience) {
         console.error('Narrative not found for:', verb);
         return;
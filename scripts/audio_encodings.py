@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Additional encodings of every clip for smaller downloads
+Each MP3 clip and sprite gets Opus/WebM and AAC/M4A siblings at bitrates
+sized for speech (mono, 24 kHz source). Encodes run in parallel and are
+cached by source hash, so unchanged clips are never re-encoded.
+
+Every encoded entry in audio_metadata.json gets a "sources" list, smallest
+first, from which the client plays the first type it supports:
+
+    "sources": [
+        {"file": "assets/audio/verbs/observar.webm", "type": "audio/webm; codecs=\"opus\"", "bytes": 4301},
+        {"file": "assets/audio/verbs/observar.m4a", "type": "audio/mp4; codecs=\"mp4a.40.2\"", "bytes": 7408},
+        {"file": "assets/audio/verbs/observar.mp3", "type": "audio/mpeg", "bytes": 9792}
+    ]
+
+Usage: python scripts/audio_encodings.py [opus] [aac]   # encode what audio_metadata.json lists
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from build_config import METADATA_FILE, SITE_ROOT, site_path
+from metadata_store import MetadataStore
+from mp3_duration import clip_entries
+from synthesis_cache import materialize
+
+DEFAULT_CACHE_DIR = SITE_ROOT / ".cache" / "encoded"
+MP3_TYPE = "audio/mpeg"
+
+
+@dataclass(frozen=True)
+class Encoding:
+    """One output format; everything here is part of the cache key"""
+    extension: str
+    type: str
+    codec_args: tuple
+    version: int = 1
+
+
+# Opus is transparent for speech well below the 48 kbit/s Edge MP3s;
+# AAC covers Safari versions without Opus in WebM
+ENCODINGS = {
+    "opus": Encoding("webm", 'audio/webm; codecs="opus"',
+                     ("-c:a", "libopus", "-b:a", "20k", "-application", "voip")),
+    "aac": Encoding("m4a", 'audio/mp4; codecs="mp4a.40.2"',
+                    ("-c:a", "aac", "-b:a", "32k", "-movflags", "+faststart")),
+}
+
+
+def encode_file(source, name, cache_dir):
+    """Encode one MP3 into the named format next to it; runs in a worker thread
+
+    Returns (output path, cached).
+    """
+    encoding = ENCODINGS[name]
+    source = Path(source)
+    output = source.with_suffix(f".{encoding.extension}")
+    key = hashlib.sha256(source.read_bytes() + json.dumps(asdict(encoding)).encode()).hexdigest()
+    cached = Path(cache_dir) / key[:2] / f"{key}.{encoding.extension}"
+    if cached.is_file():
+        materialize(cached, output)
+        return output, True
+
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    temp = cached.with_name(f".{key}.tmp.{encoding.extension}")
+    subprocess.run([shutil.which("ffmpeg"), "-loglevel", "error", "-y", "-i", str(source),
+                    "-vn", "-ac", "1", *encoding.codec_args, "-map_metadata", "-1", str(temp)],
+                   check=True, capture_output=True)
+    os.replace(temp, cached)
+    materialize(cached, output)
+    return output, False
+
+
+def source_list(path, names):
+    """The sources entry for an MP3 and its encoded siblings, smallest first"""
+    path = Path(path)
+    sources = [{"file": site_path(path), "type": MP3_TYPE, "bytes": path.stat().st_size}]
+    for name in names:
+        encoded = path.with_suffix(f".{ENCODINGS[name].extension}")
+        if encoded.is_file():
+            sources.append({"file": site_path(encoded), "type": ENCODINGS[name].type,
+                            "bytes": encoded.stat().st_size})
+    return sorted(sources, key=lambda source: source["bytes"])
+
+
+class Encoder:
+    """Encode clips into extra formats on a thread pool running ffmpeg"""
+
+    def __init__(self, names, workers=None, cache_dir=DEFAULT_CACHE_DIR):
+        if not shutil.which("ffmpeg"):
+            raise RuntimeError("encoding needs ffmpeg on PATH")
+        self.names = list(names)
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+        self.encoded = 0
+        self.cached = 0
+        self.failures = []
+
+    def encode(self, entries):
+        """Encode the file of every entry and set its "sources" list"""
+        entries = [entry for entry in entries if (SITE_ROOT / entry["file"]).is_file()]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [(entry, name, pool.submit(encode_file, SITE_ROOT / entry["file"],
+                                                 name, self.cache_dir))
+                       for entry in entries for name in self.names]
+            for entry, name, future in futures:
+                try:
+                    _, cached = future.result()
+                except (OSError, subprocess.CalledProcessError) as error:
+                    self.failures.append((entry["file"], name, error))
+                    print(f"❌ Encoding failed: {entry['file']} ({name}): {error!r}")
+                    continue
+                self.cached += cached
+                self.encoded += not cached
+        for entry in entries:
+            entry["sources"] = source_list(SITE_ROOT / entry["file"], self.names)
+        return entries
+
+    def print_summary(self, entries):
+        """Print encode counts and the size of each format against MP3"""
+        print(f"\n🎚️  Encoded {self.encoded} files, {self.cached} from cache")
+        sizes = defaultdict(int)
+        for entry in entries:
+            for source in entry.get("sources", ()):
+                sizes[source["type"]] += source["bytes"]
+        if not sizes[MP3_TYPE]:
+            return
+        for name in self.names:
+            size = sizes[ENCODINGS[name].type]
+            print(f"   - {name}: {size / 1024:.0f} KB ({size / sizes[MP3_TYPE]:.0%} of MP3)")
+
+
+def encoded_entries(audio_metadata):
+    """Clip and sprite entries that get encoded siblings"""
+    return list(clip_entries(audio_metadata)) + list(audio_metadata.get("sprites", {}).values())
+
+
+def add_encoding_arguments(parser):
+    """Register the encoding flags on an argparse parser"""
+    parser.add_argument("--encode", nargs="+", choices=sorted(ENCODINGS), default=[],
+                        help="also encode clips and sprites as opus (WebM) and/or aac (M4A)")
+    parser.add_argument("--encode-workers", type=int, default=None,
+                        help="parallel ffmpeg encodes (default: CPU count)")
+
+
+def main():
+    names = sys.argv[1:] or sorted(ENCODINGS)
+    encoder = Encoder(names)
+    store = MetadataStore(METADATA_FILE)
+    entries = encoder.encode(encoded_entries(store.load()))
+    sources = {entry["file"]: entry["sources"] for entry in entries}
+    # Encoding takes a while; the lock is only held to record the result
+    with store.transaction() as audio_metadata:
+        for entry in encoded_entries(audio_metadata):
+            if entry["file"] in sources:
+                entry["sources"] = sources[entry["file"]]
+    encoder.print_summary(entries)
+    print(f"📝 Metadata updated: {METADATA_FILE}")
+    return 1 if encoder.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
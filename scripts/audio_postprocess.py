@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Post-processing of synthesized clips on a process pool
+Each clip has leading and trailing silence trimmed, short fades applied
+and is re-encoded with consistent settings. Clips are queued as soon as
+their synthesis finishes, so this CPU-bound work overlaps with the
+network-bound synthesis instead of stalling its event loop
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from build_config import SITE_ROOT
+from build_trace import tracer
+from mp3_duration import parse_mp3
+from synthesis_cache import materialize
+
+DEFAULT_CACHE_DIR = SITE_ROOT / ".cache" / "postprocess"
+
+SILENCE_START = re.compile(r"silence_start: (-?[\d.]+)")
+SILENCE_END = re.compile(r"silence_end: ([\d.]+)")
+
+
+@dataclass
+class PostProcessSettings:
+    """Everything that determines the processed output; part of the cache key"""
+    noise_db: int = -45         # quieter than this counts as silence
+    min_silence: float = 0.05   # seconds of quiet before it is trimmed
+    keep: float = 0.04          # seconds of silence kept around speech
+    fade_in: float = 0.02
+    fade_out: float = 0.05
+    sample_rate: int = 24000
+    bitrate: str = "48k"
+    version: int = 1
+
+
+def detect_silences(ffmpeg, path, settings):
+    """(start, end) pairs of silent stretches; end is None if it runs to the end"""
+    command = [ffmpeg, "-hide_banner", "-nostats", "-i", str(path), "-af",
+               f"silencedetect=noise={settings.noise_db}dB:d={settings.min_silence}",
+               "-f", "null", "-"]
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stderr
+    silences = []
+    for line in output.splitlines():
+        if match := SILENCE_START.search(line):
+            silences.append([max(0.0, float(match.group(1))), None])
+        elif (match := SILENCE_END.search(line)) and silences:
+            silences[-1][1] = float(match.group(1))
+    return silences
+
+
+def speech_bounds(silences, duration, settings):
+    """Start and end of the audible part of a clip, padded by settings.keep"""
+    start, end = 0.0, duration
+    for silence_start, silence_end in silences:
+        if silence_start <= 0.001 and silence_end is not None:
+            start = silence_end
+        if silence_end is None or silence_end >= duration - 0.001:
+            end = min(end, silence_start)
+    start = max(0.0, start - settings.keep)
+    end = min(duration, end + settings.keep)
+    if end - start <= settings.fade_in + settings.fade_out:
+        return 0.0, duration  # nothing audible detected; leave the clip whole
+    return start, end
+
+
+def process_clip(path, settings, cache_dir):
+    """Trim, fade and re-encode one clip in place; runs in a worker process
+
+    Returns {"leadMs": ms trimmed from the start, "seconds": worker time,
+    "cached": bool}. Results are cached by source hash and settings.
+    """
+    started = time.perf_counter()
+    path = Path(path)
+    settings = PostProcessSettings(**settings)
+    cache_dir = Path(cache_dir)
+    data = path.read_bytes()
+    key = hashlib.sha256(data + json.dumps(asdict(settings)).encode()).hexdigest()
+    cached = cache_dir / key[:2] / f"{key}.mp3"
+    cached_info = cached.with_suffix(".json")
+
+    if cached.is_file() and cached_info.is_file():
+        materialize(cached, path)
+        info = json.loads(cached_info.read_text(encoding="utf-8"))
+        return {**info, "seconds": time.perf_counter() - started, "cached": True}
+
+    ffmpeg = shutil.which("ffmpeg")
+    duration = parse_mp3(data).duration
+    start, end = speech_bounds(detect_silences(ffmpeg, path, settings), duration, settings)
+    length = end - start
+    filters = (f"atrim=start={start:.3f}:end={end:.3f},asetpts=PTS-STARTPTS,"
+               f"afade=t=in:st=0:d={settings.fade_in},"
+               f"afade=t=out:st={length - settings.fade_out:.3f}:d={settings.fade_out}")
+
+    temp = path.with_name(f".{path.name}.post")
+    subprocess.run([ffmpeg, "-loglevel", "error", "-y", "-i", str(path), "-af", filters,
+                    "-ac", "1", "-ar", str(settings.sample_rate), "-b:a", settings.bitrate,
+                    "-map_metadata", "-1", "-id3v2_version", "0", "-write_xing", "0",
+                    "-f", "mp3", str(temp)], check=True, capture_output=True)
+    os.replace(temp, path)
+
+    info = {"leadMs": round(start * 1000)}
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(path, cached.with_suffix(".tmp"))
+    os.replace(cached.with_suffix(".tmp"), cached)
+    cached_info.write_text(json.dumps(info), encoding="utf-8")
+    return {**info, "seconds": time.perf_counter() - started, "cached": False}
+
+
+class PostProcessor:
+    """Queue feeding clips to a process pool while synthesis is still running"""
+
+    def __init__(self, workers=None, settings=None, cache_dir=DEFAULT_CACHE_DIR, on_done=None):
+        if not shutil.which("ffmpeg"):
+            raise RuntimeError("post-processing needs ffmpeg on PATH")
+        self.workers = workers or os.cpu_count() or 1
+        self.settings = asdict(settings or PostProcessSettings())
+        self.cache_dir = str(cache_dir)
+        self.on_done = on_done
+        self.queue = asyncio.Queue()
+        self.pool = None
+        self.consumers = []
+        self.results = {}
+        self.failures = []
+        self.busy = 0.0
+        self.queue_wait = 0.0
+        self.started = None
+        self.wall = 0.0
+
+    def start(self):
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.started = time.perf_counter()
+        self.consumers = [asyncio.ensure_future(self._consume()) for _ in range(self.workers)]
+
+    def submit(self, path):
+        """Queue a finished clip; safe to call from a scheduler callback"""
+        self.queue.put_nowait((Path(path), time.perf_counter()))
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while (item := await self.queue.get()) is not None:
+            path, queued = item
+            self.queue_wait += time.perf_counter() - queued
+            try:
+                with tracer.clip(path.name, category="postprocess", queued_since=queued), \
+                        tracer.span("postprocess", category="postprocess"):
+                    info = await loop.run_in_executor(self.pool, process_clip, str(path),
+                                                      self.settings, self.cache_dir)
+            except Exception as error:
+                self.failures.append((path, error))
+                print(f"❌ Post-processing failed: {path.name}: {error!r}")
+            else:
+                self.results[path] = info
+                self.busy += info["seconds"]
+                if self.on_done:
+                    self.on_done(path, info)
+
+    async def finish(self):
+        """Wait for every queued clip, then shut the pool down"""
+        for _ in self.consumers:
+            self.queue.put_nowait(None)
+        try:
+            await asyncio.gather(*self.consumers)
+        finally:
+            self.pool.shutdown()
+        self.wall = time.perf_counter() - self.started
+
+    def print_summary(self):
+        done = len(self.results)
+        cached = sum(1 for info in self.results.values() if info["cached"])
+        utilization = self.busy / (self.wall * self.workers) if self.wall else 0.0
+        print(f"\n🎚️  Post-processed {done} clips ({cached} cached) on {self.workers} workers")
+        print(f"   - {self.wall:.2f}s wall, {self.busy:.2f}s worker time, "
+              f"{utilization:.0%} pool utilization")
+        if done:
+            print(f"   - {self.queue_wait / done * 1000:.0f} ms average queue wait")
+        if self.failures:
+            print(f"   - {len(self.failures)} clips failed post-processing")
+
+
+def shift_word_timings(words, lead_ms):
+    """Move word timings to account for silence trimmed from the start"""
+    if words and lead_ms:
+        words["start"] = [max(0, start - lead_ms) for start in words["start"]]
+
+
+def add_postprocess_arguments(parser):
+    """Register the post-processing flags on an argparse parser"""
+    parser.add_argument("--postprocess", action="store_true",
+                        help="trim silence, fade and re-encode clips with ffmpeg")
+    parser.add_argument("--postprocess-workers", type=int, default=None,
+                        help="post-processing worker processes (default: CPU count)")
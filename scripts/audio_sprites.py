@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Audio sprites: one file per verb holding its pronunciation and examples
+Clips are joined at MP3 frame boundaries without re-encoding, separated by
+short runs of silent frames, and the offset/duration of every clip is
+recorded so the client can seek into the sprite instead of requesting
+each small clip separately.
+
+The sprites section of audio_metadata.json uses parallel arrays:
+
+    "sprites": {
+        "observar": {
+            "file": "assets/audio/sprites/observar.mp3",
+            "clips": ["assets/audio/verbs/observar.mp3", ...],
+            "start": [0, 1944, ...],      # ms into the sprite
+            "duration": [1632, 3504, ...] # ms of audio for the clip
+        }
+    }
+
+Usage: python scripts/audio_sprites.py   # sprite the clips in data/audio_metadata.json
+"""
+
+import math
+import sys
+from pathlib import Path
+
+from build_config import METADATA_FILE, SITE_ROOT, SPRITES_DIR, site_path
+from json_io import write_if_changed
+from metadata_store import MetadataStore
+from mp3_duration import iter_frames, parse_header, read_xing
+
+# Silence between clips, so a late pause never bleeds into the next clip
+GAP_SECONDS = 0.3
+
+
+def silent_frame(data, offset):
+    """A silent frame with the stream parameters of the frame at offset
+
+    Zeroed side information and main data decode to silence; the header
+    is kept except for CRC protection and padding, which are dropped.
+    """
+    word = int.from_bytes(data[offset:offset + 4], "big")
+    word |= 1 << 16        # protection bit set: no CRC follows the header
+    word &= ~(1 << 9)      # no padding slot
+    header = word.to_bytes(4, "big")
+    return header + bytes(parse_header(header, 0).length - 4)
+
+
+def clip_frames(data):
+    """(audio frames as bytes, frame count, first frame offset, first header)"""
+    frames = list(iter_frames(data))
+    if not frames:
+        raise ValueError("no MPEG audio frames found")
+    offset, header = frames[0]
+    if read_xing(data, offset, header):
+        frames = frames[1:]  # the Xing/Info frame describes the old file only
+    body = b"".join(data[start:start + frame.length] for start, frame in frames)
+    return body, len(frames), offset, header
+
+
+def stream_format(header):
+    return (header.mpeg1, header.layer, header.sample_rate, header.mono)
+
+
+def build_sprite(paths):
+    """Join clips into one MP3 stream; return (bytes, start ms, duration ms)"""
+    chunks = []
+    starts = []
+    durations = []
+    samples = 0
+    expected = None
+    for path in paths:
+        data = Path(path).read_bytes()
+        body, count, offset, header = clip_frames(data)
+        if expected is None:
+            expected = stream_format(header)
+            gap = silent_frame(data, offset)
+            gap_frames = math.ceil(GAP_SECONDS * header.sample_rate / header.samples)
+        elif stream_format(header) != expected:
+            raise ValueError(f"{Path(path).name} does not match the sprite's stream format")
+
+        if chunks:
+            chunks.append(gap * gap_frames)
+            samples += gap_frames * header.samples
+        starts.append(round(samples * 1000 / header.sample_rate))
+        durations.append(round(count * header.samples * 1000 / header.sample_rate))
+        chunks.append(body)
+        samples += count * header.samples
+    return b"".join(chunks), starts, durations
+
+
+def write_sprites(audio_metadata):
+    """Build a sprite per verb and return the sprites metadata section"""
+    sprites = {}
+    for verb, verb_entry in audio_metadata.get("verbs", {}).items():
+        clips = [verb_entry["file"]]
+        clips += [entry["file"] for entry in audio_metadata.get("examples", {}).get(verb, [])]
+        paths = [SITE_ROOT / file for file in clips]
+        if not all(path.is_file() for path in paths):
+            print(f"⚠️  Skipping sprite for {verb}: missing clips")
+            continue
+        try:
+            data, starts, durations = build_sprite(paths)
+        except ValueError as error:
+            print(f"⚠️  Skipping sprite for {verb}: {error}")
+            continue
+
+        output = SPRITES_DIR / f"{verb}.mp3"
+        if write_if_changed(output, data):
+            print(f"🧩 Sprite: {output.name} ({len(clips)} clips, {len(data)} bytes)")
+        sprites[verb] = {
+            "file": site_path(output),
+            "clips": clips,
+            "start": starts,
+            "duration": durations
+        }
+    return sprites
+
+
+def main():
+    store = MetadataStore(METADATA_FILE)
+    store.update({"sprites": write_sprites(store.load())})
+    print(f"📝 Metadata updated: {METADATA_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
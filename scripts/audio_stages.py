@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Audio stages of the asset build
+Planning stages turn synonyms.json into synthesis jobs plus their
+audio_metadata.json entries; the later stages synthesize the jobs and
+measure the resulting clips
+"""
+
+import copy
+from collections import defaultdict
+from functools import partial
+
+from audio_encodings import Encoder, encoded_entries
+from audio_postprocess import PostProcessor, shift_word_timings
+from audio_sprites import write_sprites
+from build_config import (EXAMPLES_DIR, NARRATIVES_DIR, SITE_ROOT, STAGING_DIR, VERBS_DIR,
+                          site_path, voice_for)
+from build_trace import tracer
+from incremental import carry_over, remove_orphans, select_changed
+from mp3_duration import apply_durations
+from narrative_split import join_parts, split_narrative
+from synthesis_cache import SynthesisCache, materialize, normalize_text
+from synthesis_scheduler import SynthesisJob, scheduler_from_args
+from word_timings import encode_word_timings
+
+
+async def generate_clip(backend, text, output_path, voice):
+    """Generate one audio file with the selected TTS backend"""
+    result = await backend.synthesize(text, output_path, voice)
+    print(f"✅ Generated: {output_path.name} ({voice}, {result.bytes_written} bytes)")
+    return {"words": encode_word_timings(result.events, text)}
+
+
+def voice_metadata(backend):
+    """Voices section of audio_metadata.json for a backend"""
+    voices = {}
+    for voice_id, voice_name in backend.voices.items():
+        region, gender = voice_id.split('_')[:2]
+        voices[voice_id] = {
+            "name": voice_name,
+            "region": region.upper(),
+            "gender": gender
+        }
+    return voices
+
+
+def plan_verbs(context):
+    """One pronunciation clip per verb"""
+    section = context.metadata["verbs"] = {}
+    for synonym in context.synonyms:
+        verb = synonym["verb"]
+        section[verb] = context.add_clip(verb, VERBS_DIR / f"{verb}.mp3", voice_for(verb))
+    context.outputs.append((VERBS_DIR, "*.mp3"))
+
+
+def plan_examples(context):
+    """One clip per example sentence, in the verb's voice for consistency"""
+    section = context.metadata["examples"] = {}
+    for synonym in context.synonyms:
+        verb = synonym["verb"]
+        section[verb] = [
+            context.add_clip(example, EXAMPLES_DIR / f"{verb}_example_{i}.mp3", voice_for(verb))
+            for i, example in enumerate(synonym["examples"], 1)
+        ]
+    context.outputs.append((EXAMPLES_DIR, "*_example_*.mp3"))
+
+
+def plan_narratives(context):
+    """One clip per narrative part, for verbs that have a narrative"""
+    section = context.metadata["narratives"] = {}
+    for synonym in context.synonyms:
+        narrative = synonym.get("narrativeExperience")
+        if not narrative:
+            continue
+        verb = synonym["verb"]
+        voice_id = voice_for(verb)
+        first_job = len(context.jobs)
+        section[verb] = {
+            "title": narrative["title"],
+            "voice": voice_id,
+            "parts": [
+                context.add_clip(part_text, NARRATIVES_DIR / f"{verb}_part_{i}.mp3",
+                                 voice_id, partNumber=i)
+                for i, part_text in enumerate(narrative["parts"], 1)
+            ]
+        }
+        context.narrative_parts[verb] = context.jobs[first_job:]
+    context.outputs.append((NARRATIVES_DIR, "*_part_*.mp3"))
+
+
+def plan_requests(context, jobs):
+    """Turn clip jobs into synthesis requests
+
+    Returns (requests, splits, copies). Identical (normalized text, voice)
+    requests are synthesized once: copies maps the output of the request
+    that is kept to the outputs of its duplicates.
+    """
+    requests, splits = group_narratives(context, jobs)
+    kept = {}
+    copies = defaultdict(list)
+    for request in requests:
+        key = (normalize_text(request.text), request.voice)
+        if key in kept:
+            copies[kept[key].output_path].append(request.output_path)
+        else:
+            kept[key] = request
+    context.deduplicated = len(requests) - len(kept)
+    return list(kept.values()), splits, copies
+
+
+def group_narratives(context, jobs):
+    """With --single-request-narratives, one request per changed narrative
+
+    Returns (requests, splits), where splits maps the output of a whole
+    narrative request to the part jobs it is cut into.
+    """
+    if not context.args.single_request_narratives or not context.narrative_parts:
+        return jobs, {}
+    if not context.backend.reports_words:
+        print(f"⚠️  The {context.backend.name} backend reports no word boundaries; "
+              f"synthesizing narrative parts separately\n")
+        return jobs, {}
+
+    narrative_of = {job.output_path: verb
+                    for verb, parts in context.narrative_parts.items() for job in parts}
+    requests = [job for job in jobs if job.output_path not in narrative_of]
+    splits = {}
+    for verb in dict.fromkeys(narrative_of[job.output_path] for job in jobs
+                              if job.output_path in narrative_of):
+        parts = context.narrative_parts[verb]
+        output_path = STAGING_DIR / f"{verb}_narrative.mp3"
+        requests.append(SynthesisJob(join_parts([job.text for job in parts]),
+                                     output_path, parts[0].voice))
+        splits[output_path] = parts
+    return requests, splits
+
+
+def with_fan_out(synthesize, splits, copies):
+    """Wrap synthesize to return [(clip path, clip info)] for every clip a request produces"""
+    def expand(output_path, clip):
+        if output_path not in splits:
+            return [(output_path, clip)]
+        with tracer.span("split", parts=len(splits[output_path])):
+            return split_narrative(output_path, clip.get("words"), splits[output_path])
+
+    async def fanned_out(text, output_path, voice):
+        clip = await synthesize(text, output_path, voice)
+        clips = expand(output_path, clip)
+        for duplicate in copies.get(output_path, ()):
+            materialize(output_path, duplicate)
+            # Post-processing shifts word timings in place, once per clip
+            clips += expand(duplicate, copy.deepcopy(clip))
+        return clips
+    return fanned_out
+
+
+def verb_entries(name, value):
+    """The clip entries of one verb in an audio_metadata.json section"""
+    if name == "verbs":
+        return [value]
+    return value["parts"] if name == "narratives" else value
+
+
+def drop_failed(context, failed):
+    """Leave every verb section holding a failed clip out of this run's metadata
+
+    write_metadata then keeps what audio_metadata.json already records for
+    that verb, so no entry points at a file that was never written, and the
+    next incremental run retries the clip because its text still differs.
+    """
+    failed = {site_path(path) for path in failed}
+    for name in ("verbs", "examples", "narratives"):
+        section = context.metadata.get(name, {})
+        for verb in list(section):
+            if any(entry["file"] in failed for entry in verb_entries(name, section[verb])):
+                del section[verb]
+                print(f"⚠️  Keeping the previous {name} metadata of {verb!r}: a clip failed")
+
+
+async def synthesize_clips(context):
+    """Synthesize every planned clip through the shared scheduler and cache"""
+    args = context.args
+    backend = context.backend
+    if backend.records_voices:
+        context.metadata["voices"] = voice_metadata(backend)
+    jobs = context.jobs
+
+    # In incremental mode only added or edited clips are synthesized
+    if args.incremental:
+        wanted = [job.output_path for job in jobs]
+        for directory, pattern in context.outputs:
+            remove_orphans(directory, pattern, wanted)
+        carry_over(context.entries.values(), context.previous, ("words", "engine"))
+        jobs = select_changed(jobs, context.previous, SITE_ROOT, backend.engine_version)
+        print(f"🔍 Incremental: {len(jobs)} of {len(context.jobs)} clips changed\n")
+
+    # Clips an interrupted run already finished are rebuilt from its journal
+    unprocessed = []
+    if args.resume:
+        completed, jobs = context.journal.split_completed(jobs, backend.engine_version)
+        for job, record in completed:
+            words = record.get("words")
+            if record["stage"] == "postprocessed":
+                shift_word_timings(words, record["leadMs"])
+            elif args.postprocess:
+                unprocessed.append(job.output_path)
+            if words:
+                context.entries[job.output_path]["words"] = words
+            context.entries[job.output_path]["engine"] = record["engine"]
+        print(f"♻️  Resume: {len(completed)} clips taken from the journal\n")
+    context.journal.open(resume=args.resume)
+    requests, splits, copies = plan_requests(context, jobs)
+
+    # Unchanged clips are served from the cache instead of the network
+    synthesize = partial(generate_clip, backend)
+    if not args.no_cache:
+        context.cache = SynthesisCache(args.cache_dir, engine_version=backend.engine_version)
+        synthesize = context.cache.wrap(synthesize, backend.voice_name)
+    synthesize = with_fan_out(synthesize, splits, copies)
+
+    if args.postprocess:
+        context.postprocessor = PostProcessor(args.postprocess_workers,
+                                              on_done=context.journal.record_postprocessed)
+        context.postprocessor.start()
+        for output_path in unprocessed:
+            context.postprocessor.submit(output_path)
+
+    finished = set()
+
+    def on_success(request, clips):
+        for output_path, clip in clips:
+            finished.add(output_path)
+            entry = context.entries[output_path]
+            # Which engine made the clip, so another backend's clips count as changed
+            entry["engine"] = backend.engine_version
+            context.journal.record_synthesized(output_path, entry["text"], entry["voice"],
+                                               entry["engine"], clip.get("words"))
+            # Word timings drive the synced highlighting
+            if clip.get("words"):
+                entry["words"] = clip["words"]
+            # Finished clips go straight to the post-processing pool
+            if context.postprocessor:
+                context.postprocessor.submit(output_path)
+
+    # Execute all audio generation requests under the concurrency caps
+    context.report = await scheduler_from_args(synthesize, args).run(requests, on_success)
+    if not context.report.ok:
+        drop_failed(context, [job.output_path for job in jobs if job.output_path not in finished])
+
+
+async def postprocess_clips(context):
+    """Wait for post-processing still running after synthesis finished"""
+    processor = context.postprocessor
+    if not processor:
+        return
+    await processor.finish()
+    for path, info in processor.results.items():
+        shift_word_timings(context.entries[path].get("words"), info["leadMs"])
+
+
+def measure_clips(context):
+    """Measure exact clip durations from the MP3 frame headers"""
+    apply_durations(context.metadata, SITE_ROOT)
+
+
+def drop_sprites(context):
+    """Delete the sprites of verbs whose clips this run planned
+
+    They would keep playing the clips as they were before this run, so
+    write_metadata removes their entries and the page falls back to the
+    standalone clips.
+    """
+    verbs = set(context.metadata.get("verbs", {})) | set(context.metadata.get("examples", {}))
+    context.metadata["sprites"] = {}
+    for verb, sprite in context.previous.get("sprites", {}).items():
+        if verb not in verbs:
+            continue
+        for source in sprite.get("sources", []) + [sprite]:
+            (SITE_ROOT / source["file"]).unlink(missing_ok=True)
+        context.dropped.add(("sprites", verb))
+        print(f"🗑️  Removed sprite of {verb!r}: --no-sprites")
+
+
+def build_sprites(context):
+    """Pack each verb's pronunciation and examples into one sprite file"""
+    if context.args.no_sprites:
+        drop_sprites(context)
+        return
+    if "verbs" not in context.metadata and "examples" not in context.metadata:
+        return
+    # A partial run still sprites with the clips an earlier run produced
+    audio_metadata = {**context.previous, **context.metadata}
+    context.metadata["sprites"] = write_sprites(audio_metadata)
+
+
+def encode_clips(context):
+    """Encode this run's clips and sprites as smaller Opus and AAC siblings"""
+    if not context.args.encode:
+        return
+    context.encoder = Encoder(context.args.encode, context.args.encode_workers)
+    context.encoder.encode(encoded_entries(context.metadata))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Streaming writer for synthesized audio
+Chunks go straight to a temporary file next to the destination, which is
+fsynced and atomically renamed into place only once the stream completes,
+so a crashed or throttled run never leaves a truncated MP3 behind
+"""
+
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from build_trace import tracer
+
+# mkstemp creates files private to the owner; published clips get the
+# permissions a plain open() would have given them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+
+@dataclass
+class StreamResult:
+    """What a completed stream produced besides the audio file"""
+    bytes_written: int = 0
+    events: list = field(default_factory=list)
+
+
+def fsync_directory(directory):
+    """Persist a rename on filesystems that need the directory synced too"""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+async def write_stream(chunks, output_path):
+    """Write an async stream of Edge-style chunks to output_path atomically
+
+    Audio chunks ({"type": "audio", "data": ...}) are appended to the file
+    as they arrive; every other chunk is kept on the result for callers
+    that need it.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=output_path.parent,
+                                     prefix=f".{output_path.name}.", suffix=".part")
+    result = StreamResult()
+    requested = time.perf_counter()
+    first_chunk = None
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async for chunk in chunks:
+                if first_chunk is None:
+                    # Until the first chunk arrives the engine is connecting
+                    first_chunk = time.perf_counter()
+                    tracer.complete("connect", requested)
+                if chunk["type"] == "audio":
+                    f.write(chunk["data"])
+                    result.bytes_written += len(chunk["data"])
+                else:
+                    result.events.append(chunk)
+            tracer.complete("synthesis", first_chunk or requested)
+            if not result.bytes_written:
+                raise RuntimeError(f"no audio received for {output_path.name}")
+            with tracer.span("disk write", bytes=result.bytes_written):
+                f.flush()
+                os.fsync(f.fileno())
+        with tracer.span("disk write", step="rename"):
+            os.chmod(temp_name, FILE_MODE)
+            os.replace(temp_name, output_path)
+            fsync_directory(output_path.parent)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return result
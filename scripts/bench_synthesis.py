@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Synthesis throughput benchmarks
+Runs the real synthesis path (Edge backend, streaming writer, scheduler)
+against scripts/fake_tts_server.py in a child process, sweeping
+concurrency and corpus size. Every run reports clips/s, p50/p95/p99
+per-clip latency, peak RSS and peak open sockets of this process, and the
+whole sweep is written as JSON to diff between releases.
+
+Usage:
+    python scripts/bench_synthesis.py --output bench.json
+    python scripts/bench_synthesis.py --sizes 100 --concurrency 4 8 --latency 0.3 --error-rate 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from build_config import SYNONYMS_FILE, voice_for
+from fake_tts_server import add_server_arguments
+from json_io import load_json, write_json
+from synthesis_scheduler import DEFAULT_ATTEMPTS, DEFAULT_PER_VOICE, SynthesisJob, SynthesisScheduler
+from tts_backends import EdgeBackend
+from word_timings import encode_word_timings
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_CONCURRENCY = (1, 4, 8, 16)
+SAMPLE_INTERVAL = 0.05
+
+
+def load_sentences():
+    """(sentence, voice) pairs from the examples and narratives"""
+    sentences = []
+    for synonym in load_json(SYNONYMS_FILE):
+        voice = voice_for(synonym["verb"])
+        texts = list(synonym["examples"])
+        for part in (synonym.get("narrativeExperience") or {}).get("parts", []):
+            texts += re.split(r"(?<=[.!?])\s+", part)
+        sentences += [(text, voice) for text in texts if text.strip()]
+    return sentences
+
+
+def corpus_jobs(sentences, size, directory):
+    """size jobs cycling through the sentences"""
+    jobs = []
+    for i in range(size):
+        text, voice = sentences[i % len(sentences)]
+        jobs.append(SynthesisJob(text, Path(directory) / f"{i:05d}.mp3", voice))
+    return jobs
+
+
+def resident_bytes():
+    """Current RSS of this process, or None where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return None
+
+
+def open_sockets():
+    """Sockets currently open in this process, or None where /proc is unavailable"""
+    try:
+        fds = os.listdir("/proc/self/fd")
+    except OSError:
+        return None
+    count = 0
+    for fd in fds:
+        try:
+            count += os.readlink(f"/proc/self/fd/{fd}").startswith("socket:")
+        except OSError:
+            pass
+    return count
+
+
+class ResourceSampler:
+    """Track peak RSS and open sockets while a run is in progress"""
+
+    def __init__(self):
+        self.peak_rss = 0
+        self.peak_sockets = 0
+        self.task = None
+
+    def sample(self):
+        rss = resident_bytes()
+        sockets = open_sockets()
+        self.peak_rss = None if rss is None else max(self.peak_rss, rss)
+        self.peak_sockets = None if sockets is None else max(self.peak_sockets, sockets)
+
+    async def run(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(SAMPLE_INTERVAL)
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.sample()
+
+
+def percentiles(latencies):
+    """p50/p95/p99 in ms"""
+    if len(latencies) < 2:
+        value = round(latencies[0] * 1000, 1) if latencies else None
+        return {"p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {name: round(cuts[rank - 1] * 1000, 1) for name, rank in
+            (("p50", 50), ("p95", 95), ("p99", 99))}
+
+
+async def run_once(backend, sentences, size, concurrency, args):
+    """Synthesize a corpus of `size` clips once and measure it"""
+    latencies = []
+
+    async def synthesize(text, output_path, voice):
+        started = time.perf_counter()
+        result = await backend.synthesize(text, output_path, voice)
+        words = encode_word_timings(result.events, text)
+        latencies.append(time.perf_counter() - started)
+        return {"words": words}
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as directory:
+        jobs = corpus_jobs(sentences, size, directory)
+        scheduler = SynthesisScheduler(synthesize, concurrency=concurrency,
+                                       per_voice=args.per_voice, attempts=args.attempts)
+        sampler = ResourceSampler()
+        sampler.start()
+        report = await scheduler.run(jobs)
+        await sampler.stop()
+
+    return {
+        "corpus": size,
+        "concurrency": concurrency,
+        "perVoice": args.per_voice,
+        "clips": len(report.succeeded),
+        "failed": len(report.failed),
+        "retries": report.retries,
+        "seconds": round(report.elapsed, 3),
+        "clipsPerSecond": round(len(report.succeeded) / report.elapsed, 2) if report.elapsed else None,
+        "latencyMs": percentiles(latencies),
+        "peakRssMb": round(sampler.peak_rss / 2 ** 20, 1) if sampler.peak_rss else None,
+        "peakSockets": sampler.peak_sockets,
+    }
+
+
+def print_run(run):
+    latency = run["latencyMs"]
+    print(f"📊 {run['corpus']:>6} clips @ {run['concurrency']:>3}: "
+          f"{run['clipsPerSecond']} clips/s, p50 {latency['p50']} ms, "
+          f"p95 {latency['p95']} ms, p99 {latency['p99']} ms, "
+          f"RSS {run['peakRssMb']} MB, {run['peakSockets']} sockets"
+          + (f", ❌ {run['failed']} failed" if run["failed"] else ""))
+
+
+def start_server(args):
+    """Start the fake service in a child process; return (process, endpoint)"""
+    command = [sys.executable, str(Path(__file__).with_name("fake_tts_server.py")),
+               "--latency", str(args.latency), "--jitter", str(args.jitter),
+               "--error-rate", str(args.error_rate)]
+    if args.seed is not None:
+        command += ["--seed", str(args.seed)]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    endpoint = server.stdout.readline().strip()
+    if not endpoint:
+        server.kill()
+        raise RuntimeError("fake TTS server did not start")
+    return server, endpoint
+
+
+async def bench(args, endpoint):
+    backend = EdgeBackend(endpoint=endpoint)
+    sentences = load_sentences()
+    runs = []
+    for size in args.sizes:
+        for concurrency in args.concurrency:
+            run = await run_once(backend, sentences, size, concurrency, args)
+            print_run(run)
+            runs.append(run)
+    return {
+        "generatedAt": datetime.utcnow().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "engine": backend.engine_version,
+        },
+        "server": {
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "errorRate": args.error_rate,
+            "seed": args.seed,
+        },
+        "runs": runs,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="corpus sizes, in sentences")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=list(DEFAULT_CONCURRENCY),
+                        help="scheduler concurrency levels to sweep")
+    parser.add_argument("--per-voice", type=int, default=DEFAULT_PER_VOICE,
+                        help="concurrent clips per voice")
+    parser.add_argument("--attempts", type=int, default=DEFAULT_ATTEMPTS,
+                        help="attempts per clip before it counts as failed")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="write the results as JSON to this file")
+    add_server_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server, endpoint = start_server(args)
+    print(f"🔍 Fake TTS server at {endpoint}\n")
+    try:
+        results = asyncio.run(bench(args, endpoint))
+    finally:
+        server.terminate()
+        server.wait()
+    if args.output:
+        write_json(args.output, results)
+        print(f"\n📝 Results saved to: {args.output}")
+    return 0 if all(not run["failed"] for run in results["runs"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Build the site's generated assets from synonyms.json
+Verb pronunciations, examples and narratives are planned as separate
+stages of one dependency graph, synthesized through a shared scheduler
+and cache, and audio_metadata.json is written once at the end of the run
+
+Usage:
+    python scripts/build_assets.py                      # everything
+    python scripts/build_assets.py --only narratives    # one kind of clip
+    python scripts/build_assets.py --backend local      # offline build
+"""
+
+import argparse
+import asyncio
+import sys
+
+from audio_encodings import add_encoding_arguments, encoded_entries
+from audio_postprocess import add_postprocess_arguments
+from audio_stages import (build_sprites, encode_clips, measure_clips, plan_examples,
+                          plan_narratives, plan_verbs, postprocess_clips, synthesize_clips)
+from build_config import METADATA_FILE, SYNONYMS_FILE, site_path
+from build_pipeline import Pipeline, print_timings
+from build_trace import add_trace_arguments, tracer
+from data_bundle import write_bundle
+from data_validation import DataValidationError, validate_data
+from facet_index import write_facets
+from fingerprint import add_fingerprint_arguments, fingerprint_assets, plain_references
+from incremental import add_incremental_arguments
+from metadata_store import MetadataStore, verb_pruner
+from search_index import write_search_index
+from precompress import add_precompress_arguments, precompress, precompress_targets
+from service_worker import add_service_worker_arguments, write_service_worker
+from run_journal import Journal, add_journal_arguments
+from synthesis_cache import add_cache_arguments
+from synthesis_scheduler import SynthesisJob, add_scheduler_arguments
+from tts_backends import EdgeBackend, add_backend_arguments, create_backend
+
+# Stages that plan clips; --only picks a subset of them
+CLIP_STAGES = ("verbs", "examples", "narratives")
+
+
+class BuildContext:
+    """State shared by the stages of one build run"""
+
+    def __init__(self, args):
+        self.args = args
+        self.synonyms = []      # set by the validate stage, like previous
+        self.previous = {}      # audio_metadata.json as the last run left it
+        self.backend = create_backend(args.backend)
+        self.metadata = {}      # audio_metadata.json sections produced by this run
+        self.jobs = []
+        self.entries = {}       # output path -> metadata entry
+        self.outputs = []       # (directory, glob) of every clip kind planned
+        self.narrative_parts = {}  # verb -> jobs of its narrative parts, in order
+        self.deduplicated = 0   # clips reused from an identical request
+        self.dropped = set()    # (section, verb) entries write_metadata removes
+        self.cache = None
+        self.report = None
+        self.postprocessor = None
+        self.encoder = None
+        self.journal = Journal(args.journal)
+
+    def add_clip(self, text, output_path, voice, **fields):
+        """Plan one clip and return its metadata entry"""
+        self.jobs.append(SynthesisJob(text, output_path, voice))
+        entry = self.entries[output_path] = {
+            **fields,
+            "file": site_path(output_path),
+            "voice": voice,
+            "text": text
+        }
+        return entry
+
+
+def validate(context):
+    """Check every data file before any clip is planned or synthesized"""
+    data = validate_data(context.backend.voices)
+    context.synonyms = data[SYNONYMS_FILE]
+    # Stages work on plain names; fingerprinting is reapplied at the end
+    context.previous = plain_references(data[METADATA_FILE] or {})
+
+
+def write_metadata(context):
+    """Merge the entries this run produced, keeping every other entry"""
+    verbs = [synonym["verb"] for synonym in context.synonyms]
+    store = MetadataStore(METADATA_FILE)
+    if store.update(context.metadata, prune=verb_pruner(verbs, context.dropped)):
+        print(f"\n📝 Audio metadata saved to: {METADATA_FILE}")
+    else:
+        print(f"\n📝 Audio metadata unchanged: {METADATA_FILE}")
+
+
+def fingerprint_site(context):
+    """Point the data files at content-hashed copies of every asset"""
+    if context.args.fingerprint:
+        fingerprint_assets(context.args.keep_builds)
+
+
+def bundle_data(context):
+    """Join the data files into the bundle the page loads first"""
+    write_bundle(context.args.keep_builds)
+
+
+def index_search(context):
+    """Rebuild the folded search index over synonyms and narratives"""
+    write_search_index()
+
+
+def index_facets(context):
+    """Rebuild the filter bitsets and counts"""
+    write_facets()
+
+
+def build_service_worker(context):
+    """Regenerate the precache manifest and service worker for the new assets"""
+    if not context.args.no_service_worker:
+        write_service_worker()
+
+
+def precompress_site(context):
+    """Write .gz/.br siblings of the text assets, including the new metadata"""
+    if context.args.precompress:
+        precompress(precompress_targets())
+
+
+def build_pipeline():
+    """The asset build as a dependency graph of stages"""
+    pipeline = Pipeline()
+    pipeline.add("validate", validate)
+    pipeline.add("verbs", plan_verbs, after=("validate",))
+    pipeline.add("examples", plan_examples, after=("validate",))
+    pipeline.add("narratives", plan_narratives, after=("validate",))
+    pipeline.add("synthesize", synthesize_clips, after=CLIP_STAGES)
+    pipeline.add("postprocess", postprocess_clips, after=("synthesize",))
+    pipeline.add("durations", measure_clips, after=("postprocess",))
+    pipeline.add("sprites", build_sprites, after=("durations",))
+    pipeline.add("encode", encode_clips, after=("sprites",))
+    pipeline.add("metadata", write_metadata, after=("encode",))
+    pipeline.add("fingerprint", fingerprint_site, after=("metadata",))
+    pipeline.add("bundle", bundle_data, after=("fingerprint",))
+    pipeline.add("search-index", index_search, after=("validate",))
+    pipeline.add("facets", index_facets, after=("validate",))
+    pipeline.add("service-worker", build_service_worker, after=("bundle", "search-index", "facets"))
+    pipeline.add("precompress", precompress_site, after=("service-worker",))
+    return pipeline
+
+
+def print_summary(context):
+    metadata = context.metadata
+    print(f"\n✨ Asset build complete!")
+    if "verbs" in metadata:
+        print(f"   - {len(metadata['verbs'])} verb pronunciations")
+    if "examples" in metadata:
+        print(f"   - {sum(len(clips) for clips in metadata['examples'].values())} example pronunciations")
+    if "narratives" in metadata:
+        print(f"   - {sum(len(n['parts']) for n in metadata['narratives'].values())} narrative parts")
+    print(f"   - {len({job.voice for job in context.jobs})} different voices used")
+    if context.journal.resumed:
+        print(f"   - {context.journal.resumed} clips resumed from the journal")
+    if context.deduplicated:
+        print(f"   - {context.deduplicated} duplicate clips synthesized once and reused")
+    if context.cache:
+        context.cache.print_summary()
+    if context.postprocessor:
+        context.postprocessor.print_summary()
+    if context.encoder:
+        context.encoder.print_summary(encoded_entries(context.metadata))
+    context.report.print_summary()
+
+
+async def build(args):
+    """Run the pipeline for the selected clip stages; return the exit code"""
+    if args.trace:
+        tracer.enable()
+    context = BuildContext(args)
+    skip = set(CLIP_STAGES) - set(args.only)
+
+    print("🎙️  Generating audio files with multiple LATAM voices...\n")
+    try:
+        timings = await build_pipeline().run(context, skip=skip)
+    except DataValidationError as error:
+        print(f"\n{error}")
+        return 1
+    finally:
+        context.journal.close()
+        # A trace is most useful for the run that failed or stalled
+        if args.trace:
+            tracer.write(args.trace)
+
+    print_summary(context)
+    print_timings(timings)
+    failed = (not context.report.ok
+              or (context.postprocessor and context.postprocessor.failures)
+              or (context.encoder and context.encoder.failures))
+    if not failed:
+        # Everything is in audio_metadata.json now; a failed run keeps its
+        # journal so --resume only retries what is missing
+        context.journal.clear()
+    return 1 if failed else 0
+
+
+async def list_available_voices():
+    """List all available Spanish voices for reference"""
+    print("\n🎤 Available Spanish voices in Edge TTS:\n")
+    voices = await EdgeBackend().list_voices()
+    spanish_voices = [v for v in voices if v['Locale'].startswith('es-')]
+
+    for voice in spanish_voices:
+        locale = voice['Locale']
+        name = voice['ShortName']
+        gender = voice['Gender']
+        print(f"   {locale:8} | {gender:6} | {name}")
+    print()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=CLIP_STAGES, default=list(CLIP_STAGES),
+                        help="clip kinds to build (default: all)")
+    parser.add_argument("--no-sprites", action="store_true",
+                        help="do not pack verb and example clips into per-verb sprites")
+    parser.add_argument("--single-request-narratives", action="store_true",
+                        help="synthesize each narrative in one request and split it into parts")
+    parser.add_argument("--list-voices", action="store_true",
+                        help="list the Spanish voices available in Edge TTS")
+    add_backend_arguments(parser)
+    add_scheduler_arguments(parser)
+    add_cache_arguments(parser)
+    add_incremental_arguments(parser)
+    add_journal_arguments(parser)
+    add_postprocess_arguments(parser)
+    add_encoding_arguments(parser)
+    add_fingerprint_arguments(parser)
+    add_service_worker_arguments(parser)
+    add_precompress_arguments(parser)
+    add_trace_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.list_voices:
+        asyncio.run(list_available_voices())
+        return 0
+    return asyncio.run(build(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
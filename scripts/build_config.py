@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Shared paths and voice assignments for the asset build
+Everything is relative to the site root that index.html is served from
+"""
+
+from pathlib import Path
+
+SITE_ROOT = Path(__file__).parent.parent
+DATA_DIR = SITE_ROOT / "data"
+AUDIO_DIR = SITE_ROOT / "assets" / "audio"
+VERBS_DIR = AUDIO_DIR / "verbs"
+EXAMPLES_DIR = AUDIO_DIR / "examples"
+NARRATIVES_DIR = AUDIO_DIR / "narratives"
+SPRITES_DIR = AUDIO_DIR / "sprites"
+# Where image_credits.json filenames live: the hero and one per verb
+HERO_IMAGES_DIR = SITE_ROOT / "assets" / "images" / "hero"
+SYNONYM_IMAGES_DIR = SITE_ROOT / "assets" / "images" / "synonyms"
+# Intermediate audio that is not served, such as whole narratives before splitting
+STAGING_DIR = SITE_ROOT / ".cache" / "staging"
+
+SYNONYMS_FILE = DATA_DIR / "synonyms.json"
+METADATA_FILE = DATA_DIR / "audio_metadata.json"
+IMAGE_CREDITS_FILE = DATA_DIR / "image_credits.json"
+
+# Map each verb to a specific voice for variety
+# Using different voices and genders throughout
+VERB_VOICE_MAPPING = {
+    "observar": "mx_female_1",      # Mexican female
+    "contemplar": "co_male_1",      # Colombian male
+    "avistar": "ar_female_1",       # Argentine female
+    "divisar": "mx_male_1",         # Mexican male
+    "percibir": "co_female_1",      # Colombian female
+    "advertir": "ar_male_1",        # Argentine male
+    "notar": "us_female_1",         # Neutral female
+    "vislumbrar": "mx_female_1",    # Mexican female
+    "atisbar": "co_male_1",         # Colombian male
+    "otear": "ar_female_1",         # Argentine female
+    "acechar": "mx_male_1",         # Mexican male
+    "columbrar": "us_male_1",       # Neutral male
+    "constatar": "co_female_1",     # Colombian female
+    "entrever": "ar_male_1",        # Argentine male
+}
+DEFAULT_VOICE = "us_female_1"
+
+
+def voice_for(verb):
+    """Voice used for a verb's pronunciation, examples and narrative"""
+    return VERB_VOICE_MAPPING.get(verb, DEFAULT_VOICE)
+
+
+def site_path(path):
+    """Path relative to the site root, as referenced from the data files"""
+    return Path(path).relative_to(SITE_ROOT).as_posix()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Minimal dependency-graph runner for the asset build
+Stages are plain functions (or coroutines) that take the build context;
+each runs after the stages it depends on, and skipped stages are simply
+left out of the order
+"""
+
+import inspect
+import time
+from dataclasses import dataclass
+
+from build_trace import tracer
+
+
+@dataclass
+class Stage:
+    """One named step of the build and the stages it runs after"""
+    name: str
+    run: object
+    after: tuple = ()
+
+
+class Pipeline:
+    """Ordered set of stages forming a dependency graph"""
+
+    def __init__(self):
+        self.stages = {}
+
+    def add(self, name, run, after=()):
+        """Register a stage; every name in `after` must already exist"""
+        for dependency in after:
+            if dependency not in self.stages:
+                raise ValueError(f"stage {name!r} depends on unknown stage {dependency!r}")
+        self.stages[name] = Stage(name, run, tuple(after))
+        return self
+
+    def order(self, skip=()):
+        """Topological order of the stages that are not skipped
+
+        Stages are added after their dependencies, so insertion order
+        already is a valid order; skipping a stage does not skip the
+        stages that depend on it.
+        """
+        return [stage for name, stage in self.stages.items() if name not in skip]
+
+    async def run(self, context, skip=()):
+        """Run every stage in order and return {stage name: seconds}"""
+        timings = {}
+        for stage in self.order(skip):
+            started = time.perf_counter()
+            with tracer.span(stage.name, category="stage"):
+                result = stage.run(context)
+                if inspect.isawaitable(result):
+                    await result
+            timings[stage.name] = time.perf_counter() - started
+        return timings
+
+
+def print_timings(timings):
+    """Print how long each stage took"""
+    print("\n📊 Stage timings:")
+    for name, seconds in timings.items():
+        print(f"   {name:<12} {seconds:8.2f}s")
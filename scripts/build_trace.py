@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Timeline tracing for the asset build, in Chrome trace-event format
+Open the file written by --trace in chrome://tracing or ui.perfetto.dev.
+
+Build stages run on the "main" track. Every clip being synthesized or
+post-processed gets a free "lane" track for the duration of the attempt,
+with the connect, synthesis, disk write and postprocess spans nested
+under it and tagged with the clip and its voice. Time spent queued for a
+concurrency slot is shown as async "queue wait" spans.
+
+Tracing is off unless enabled, and the span helpers then do nothing.
+"""
+
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from itertools import count
+
+from json_io import write_json
+
+_lane = contextvars.ContextVar("trace_lane", default=0)
+_tags = contextvars.ContextVar("trace_tags", default={})
+
+
+class Tracer:
+    """Collects complete ("X") and async ("b"/"e") trace events"""
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.origin = time.perf_counter()
+        self.free_lanes = []
+        self.lanes = 0
+        self.ids = count(1)
+
+    def enable(self):
+        self.enabled = True
+        self.origin = time.perf_counter()
+
+    def timestamp(self, moment):
+        """perf_counter() value as microseconds since tracing started"""
+        return round((moment - self.origin) * 1_000_000)
+
+    def complete(self, name, started, category="clip", **args):
+        """Record a span from `started` (a perf_counter() value) until now"""
+        if not self.enabled:
+            return
+        self.events.append({
+            "name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": _lane.get(),
+            "ts": self.timestamp(started),
+            "dur": self.timestamp(time.perf_counter()) - self.timestamp(started),
+            "args": {**_tags.get(), **args},
+        })
+
+    @contextmanager
+    def span(self, name, category="clip", **args):
+        """Record the enclosed block as a span on the current track"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.complete(name, started, category, **args)
+
+    def waited(self, name, started, category="queue", **args):
+        """Record an async span from `started` until now, off the lanes"""
+        if not self.enabled:
+            return
+        event = {"name": name, "cat": category, "id": next(self.ids), "pid": os.getpid(),
+                 "tid": _lane.get(), "args": args}
+        self.events.append({**event, "ph": "b", "ts": self.timestamp(started)})
+        self.events.append({**event, "ph": "e", "ts": self.timestamp(time.perf_counter())})
+
+    @contextmanager
+    def clip(self, name, category="clip", queued_since=None, **tags):
+        """Run the enclosed work on a lane of its own, tagged with the clip"""
+        if not self.enabled:
+            yield
+            return
+        if queued_since is not None:
+            self.waited("queue wait", queued_since, clip=name, **tags)
+        if self.free_lanes:
+            lane = self.free_lanes.pop()
+        else:
+            self.lanes += 1
+            lane = self.lanes
+        lane_token = _lane.set(lane)
+        tags_token = _tags.set({"clip": name, **tags})
+        try:
+            with self.span(name, category):
+                yield
+        finally:
+            _tags.reset(tags_token)
+            _lane.reset(lane_token)
+            self.free_lanes.append(lane)
+
+    def write(self, path):
+        """Write the collected events as a Chrome trace file"""
+        names = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": lane,
+                  "args": {"name": f"lane {lane}" if lane else "main"}}
+                 for lane in range(self.lanes + 1)]
+        write_json(path, {"traceEvents": names + self.events, "displayTimeUnit": "ms"})
+        print(f"🔍 Trace with {len(self.events)} events saved to: {path}")
+
+
+# Shared by every module of one build run
+tracer = Tracer()
+
+
+def add_trace_arguments(parser):
+    """Register the --trace flag on an argparse parser"""
+    parser.add_argument("--trace", metavar="OUT.json", default=None,
+                        help="write a Chrome trace-event timeline of the run")
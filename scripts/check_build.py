@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Repeated-build check
+Copies the site to a temporary directory and runs the whole build there
+with the offline fake backend, several times in a row: a full build, a
+second full build over its own output and an incremental one. Every run
+has to succeed, so output of one build the next one rejects (metadata
+failing validation, say) is caught before it reaches a real build.
+
+Usage: python scripts/check_build.py [--keep]
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from build_config import SITE_ROOT
+
+# Each run's extra build_assets.py arguments, in order
+RUNS = (
+    ("full build", []),
+    ("repeated build", []),
+    ("incremental build", ["--incremental"]),
+)
+IGNORED = shutil.ignore_patterns(".git", "__pycache__", "node_modules", "*.gz", "*.br")
+
+
+def run_builds(site, cache_dir):
+    """Run every build in the copied site; returns the names of the failed ones"""
+    failed = []
+    for name, extra in RUNS:
+        command = [sys.executable, str(site / "scripts" / "build_assets.py"),
+                   "--backend", "fake", "--cache-dir", str(cache_dir), *extra]
+        print(f"🔨 {name}: {' '.join(command[1:])}")
+        result = subprocess.run(command, cwd=site, capture_output=True, text=True)
+        if result.returncode == 0:
+            print(f"   ✅ {name} succeeded")
+        else:
+            print(f"   ❌ {name} exited with {result.returncode}:\n{result.stdout}{result.stderr}")
+            failed.append(name)
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keep", action="store_true",
+                        help="leave the temporary copy of the site in place for inspection")
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp(prefix="check-build-"))
+    try:
+        site = directory / "site"
+        shutil.copytree(SITE_ROOT, site, ignore=IGNORED)
+        failed = run_builds(site, directory / "cache")
+    finally:
+        if args.keep:
+            print(f"📁 Site copy kept in {directory}")
+        else:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    if failed:
+        print(f"\n❌ {len(failed)} of {len(RUNS)} builds failed: {', '.join(failed)}")
+        return 1
+    print(f"\n✅ All {len(RUNS)} builds succeeded")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
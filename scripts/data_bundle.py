@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Pre-joined, sharded data for the client
+synonyms.json, image_credits.json and audio_metadata.json are joined by
+verb. data/bundle.json is the small index the page renders the cards
+from, the one request the first render waits on; everything a card only
+needs once it is opened goes to a per-verb detail shard named after its
+content (data/verbs/observar.3f9a1c.json), fetched when the card opens
+and cacheable forever. The index keeps the verb clip's slice of the
+sprite, since only sprites are precached for offline playback. Only the
+fields the UI reads are kept; clip text, voices and durations stay in
+audio_metadata.json.
+
+Shards no verb points to any more are kept for --keep-builds builds
+(recorded in the fingerprint ledger), so a page still holding an older
+bundle.json can open its cards.
+
+    bundle.json:
+    "hero": "assets/images/hero/hero.jpg",
+    "verbs": {
+        "observar": {
+            "verb": "observar", "quickDefinition": "...", "formality": "formal", ...,
+            "image": "...", "credit": {"photographer": "...", ...},
+            "hasNarrative": true, "audio": {"verb": {"file": "..."}},
+            "sprite": {"file": "...", "clips": ["<verb clip>"], "start": [0], "duration": [1632]},
+            "detail": "data/verbs/observar.3f9a1c.json"
+        }
+    }
+
+    data/verbs/observar.3f9a1c.json:
+    {"definition": "...", "examples": [...], "culturalNotes": "...", "narrativeExperience": {...},
+     "audio": {"examples": [{"file": "...", "words": {...}}, ...], "narrative": [...]},
+     "sprite": {"file": "...", "clips": [...], ...}}
+
+Example and narrative clips keep their word timings (see word_timings.py)
+for the highlighting in ExampleSentence and NarrativeViewer.
+
+Usage: python scripts/data_bundle.py
+"""
+
+import hashlib
+import json
+import sys
+
+from build_config import DATA_DIR, IMAGE_CREDITS_FILE, METADATA_FILE, SYNONYMS_FILE, site_path
+from fingerprint import DEFAULT_KEEP_BUILDS, Ledger, image_directory
+from json_io import load_json, write_if_changed
+
+BUNDLE_FILE = DATA_DIR / "bundle.json"
+SHARDS_DIR = DATA_DIR / "verbs"
+
+INDEX_FIELDS = ("verb", "pronunciation", "quickDefinition", "formality", "context",
+                "regions", "image")
+DETAIL_FIELDS = ("definition", "examples", "culturalNotes", "narrativeExperience")
+CREDIT_FIELDS = ("photographer", "photographerUrl", "unsplashUrl")
+CLIP_FIELDS = ("file", "sources")
+DETAIL_CLIP_FIELDS = CLIP_FIELDS + ("words",)
+SPRITE_FIELDS = ("file", "clips", "start", "duration", "sources")
+
+
+def pick(entry, fields):
+    """The given fields of an entry, skipping absent ones"""
+    return {name: entry[name] for name in fields if name in entry}
+
+
+def compact_json(data):
+    # Only the browser reads these files, so they are written without whitespace
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def verb_details(synonym, audio_metadata):
+    """What the detail modal and the narrative viewer need for one verb"""
+    verb = synonym["verb"]
+    detail = pick(synonym, DETAIL_FIELDS)
+    audio = {}
+    if verb in audio_metadata.get("examples", {}):
+        audio["examples"] = [pick(entry, DETAIL_CLIP_FIELDS)
+                             for entry in audio_metadata["examples"][verb]]
+    if verb in audio_metadata.get("narratives", {}):
+        audio["narrative"] = [pick(entry, DETAIL_CLIP_FIELDS)
+                              for entry in audio_metadata["narratives"][verb]["parts"]]
+    if audio:
+        detail["audio"] = audio
+    if verb in audio_metadata.get("sprites", {}):
+        detail["sprite"] = pick(audio_metadata["sprites"][verb], SPRITE_FIELDS)
+    return detail
+
+
+def verb_sprite(clip, sprite):
+    """The sprite cut down to the verb's own clip, or None if it is not packed"""
+    if clip["file"] not in sprite["clips"]:
+        return None
+    i = sprite["clips"].index(clip["file"])
+    return {**pick(sprite, ("file", "sources")), "clips": [clip["file"]],
+            "start": [sprite["start"][i]], "duration": [sprite["duration"][i]]}
+
+
+def build_bundle(synonyms, credits, audio_metadata):
+    """The index and {shard path: shard} for every verb, in synonyms.json order"""
+    verbs = {}
+    shards = {}
+    for synonym in synonyms:
+        verb = synonym["verb"]
+        entry = verbs[verb] = pick(synonym, INDEX_FIELDS)
+        credit = credits.get("images", {}).get(verb)
+        if credit:
+            entry["credit"] = pick(credit, CREDIT_FIELDS)
+        if synonym.get("narrativeExperience", {}).get("title"):
+            entry["hasNarrative"] = True
+        if verb in audio_metadata.get("verbs", {}):
+            entry["audio"] = {"verb": pick(audio_metadata["verbs"][verb], CLIP_FIELDS)}
+            sprite = audio_metadata.get("sprites", {}).get(verb)
+            clip_sprite = sprite and verb_sprite(entry["audio"]["verb"], sprite)
+            if clip_sprite:
+                entry["sprite"] = clip_sprite
+        shard = compact_json(verb_details(synonym, audio_metadata))
+        path = SHARDS_DIR / f"{verb}.{hashlib.sha256(shard).hexdigest()[:6]}.json"
+        entry["detail"] = site_path(path)
+        shards[path] = shard
+    bundle = {"verbs": verbs}
+    # The hero file name may be fingerprinted, so the page takes it from here
+    hero = credits.get("images", {}).get("hero")
+    if hero:
+        bundle = {"hero": site_path(image_directory("hero") / hero["filename"]), **bundle}
+    return bundle, shards
+
+
+def write_bundle(keep_builds=DEFAULT_KEEP_BUILDS):
+    """Write data/bundle.json and the detail shards; return the index"""
+    credits = load_json(IMAGE_CREDITS_FILE) if IMAGE_CREDITS_FILE.exists() else {}
+    audio_metadata = load_json(METADATA_FILE) if METADATA_FILE.exists() else {}
+    bundle, shards = build_bundle(load_json(SYNONYMS_FILE), credits, audio_metadata)
+    written = sum(write_if_changed(path, shard) for path, shard in shards.items())
+    Ledger("shards").prune([site_path(path) for path in shards], keep_builds,
+                           existing=[site_path(path) for path in sorted(SHARDS_DIR.glob("*.json"))])
+    index = compact_json(bundle)
+    if write_if_changed(BUNDLE_FILE, index) or written:
+        print(f"📦 Data bundle: {len(index)} byte index, "
+              f"{written} of {len(shards)} detail shards written")
+    return bundle
+
+
+def main():
+    write_bundle()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Schema validation of the data files before anything is synthesized
+synonyms.json, docs/literary_narratives.json, image_credits.json and
+audio_metadata.json are parsed and checked in parallel against schemas
+compiled once into check functions, then checked against each other:
+every verb needs an image on disk, an image credit and a voice. Every
+problem is reported at once, so a missing "examples" key or a mistyped
+verb fails the build before any network work instead of as a KeyError
+halfway through it.
+
+Usage: python scripts/data_validation.py
+"""
+
+import json
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from build_config import (IMAGE_CREDITS_FILE, METADATA_FILE, SITE_ROOT, SYNONYM_IMAGES_DIR,
+                          SYNONYMS_FILE, voice_for)
+from json_io import load_json
+from search_index import NARRATIVES_FILE
+from tts_backends import EDGE_VOICES
+
+TYPES = {"string": str, "integer": int, "number": (int, float), "boolean": bool,
+         "array": list, "object": dict}
+TEXT = {"pattern": r"(?s)\s*\S.*"}
+
+
+class DataValidationError(ValueError):
+    """The data files have errors; `errors` lists every one of them"""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} data error(s); nothing was synthesized")
+        self.errors = errors
+
+
+def type_name(value):
+    names = {str: "string", int: "integer", float: "number", bool: "boolean",
+             list: "array", dict: "object", type(None): "null"}
+    return names.get(type(value), type(value).__name__)
+
+
+def compile_schema(schema):
+    """Turn a schema into a check(value, where, errors) function
+
+    A schema is a type name from TYPES, a list of allowed
+    values, or a dict:
+        {"pattern": regex}                          a string matching regex
+        {"items": schema, "min": n}                 an array of at least n items
+        {"values": schema}                          an object used as a map
+        {"fields": {...}, "optional": {...},        an object with known keys;
+         "closed": True}                            closed ones allow no others
+    """
+    if isinstance(schema, str):
+        expected = TYPES[schema]
+
+        def check_type(value, where, errors):
+            if not isinstance(value, expected) or (type(value) is bool and expected is not bool):
+                errors.append(f"{where}: expected {schema}, got {type_name(value)}")
+        return check_type
+
+    if isinstance(schema, list):
+        allowed = schema
+
+        def check_enum(value, where, errors):
+            if value not in allowed:
+                errors.append(f"{where}: {value!r} is not one of {', '.join(map(str, allowed))}")
+        return check_enum
+
+    if "pattern" in schema:
+        regex = re.compile(schema["pattern"])
+
+        def check_pattern(value, where, errors):
+            if not isinstance(value, str):
+                errors.append(f"{where}: expected string, got {type_name(value)}")
+            elif not regex.fullmatch(value):
+                errors.append(f"{where}: {value!r} does not match {regex.pattern}")
+        return check_pattern
+
+    if "items" in schema:
+        check_item = compile_schema(schema["items"])
+        minimum = schema.get("min", 0)
+
+        def check_array(value, where, errors):
+            if not isinstance(value, list):
+                errors.append(f"{where}: expected array, got {type_name(value)}")
+                return
+            if len(value) < minimum:
+                errors.append(f"{where}: expected at least {minimum} item(s)")
+            for i, item in enumerate(value):
+                check_item(item, f"{where}[{i}]", errors)
+        return check_array
+
+    if "values" in schema:
+        check_value = compile_schema(schema["values"])
+
+        def check_map(value, where, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{where}: expected object, got {type_name(value)}")
+                return
+            for key, item in value.items():
+                check_value(item, f"{where}.{key}", errors)
+        return check_map
+
+    required = {key: compile_schema(item) for key, item in schema.get("fields", {}).items()}
+    optional = {key: compile_schema(item) for key, item in schema.get("optional", {}).items()}
+    closed = schema.get("closed", False)
+
+    def check_object(value, where, errors):
+        if not isinstance(value, dict):
+            errors.append(f"{where}: expected object, got {type_name(value)}")
+            return
+        for key in required:
+            if key not in value:
+                errors.append(f"{where}: missing {key!r}")
+        for key, item in value.items():
+            check = required.get(key) or optional.get(key)
+            if check:
+                check(item, f"{where}.{key}", errors)
+            elif closed:
+                errors.append(f"{where}: unknown key {key!r}")
+    return check_object
+
+
+NARRATIVE = {
+    "fields": {"title": TEXT, "parts": {"items": TEXT, "min": 1}},
+    "optional": {"literaryNote": "string"},
+}
+SYNONYM = {
+    "fields": {
+        "verb": {"pattern": r"[a-záéíóúüñ]+(?:ar|er|ir|ír)"},
+        "pronunciation": TEXT,
+        "quickDefinition": TEXT,
+        "definition": TEXT,
+        "formality": ["formal", "neutral", "informal"],
+        "context": TEXT,
+        "regions": {"items": TEXT, "min": 1},
+        "image": TEXT,
+        "examples": {"items": TEXT, "min": 1},
+    },
+    "optional": {"culturalNotes": "string", "narrativeExperience": NARRATIVE},
+    "closed": True,
+}
+SYNONYMS_SCHEMA = {"items": SYNONYM, "min": 1}
+NARRATIVES_SCHEMA = {
+    "fields": {"literaryNarratives": {"items": {
+        "fields": {"verb": TEXT, "narrativeExperience": NARRATIVE},
+    }}},
+    "optional": {"metadata": "object"},
+}
+IMAGE_CREDITS_SCHEMA = {
+    "fields": {"images": {"values": {
+        "fields": {"filename": TEXT, "photographer": "string",
+                   "photographerUrl": "string", "unsplashUrl": "string"},
+    }}},
+}
+# Parallel integer arrays, see word_timings.py
+WORDS = {"fields": {key: {"items": "integer"} for key in ("start", "duration", "index", "length")}}
+CLIP = {"fields": {"file": TEXT, "voice": TEXT, "text": "string"},
+        "optional": {"duration": "number", "words": WORDS, "sources": "array",
+                     "engine": "string"}}
+AUDIO_METADATA_SCHEMA = {
+    "optional": {
+        "verbs": {"values": CLIP},
+        "examples": {"values": {"items": CLIP}},
+        "narratives": {"values": {"fields": {"title": "string", "voice": TEXT,
+                                             "parts": {"items": CLIP}}}},
+        "voices": {"values": {"fields": {"name": TEXT, "region": TEXT, "gender": TEXT}}},
+        "sprites": {"values": {"fields": {"file": TEXT, "clips": {"items": TEXT},
+                                          "start": {"items": "integer"},
+                                          "duration": {"items": "integer"}}}},
+        "generatedAt": "string",
+    },
+}
+
+check_synonym = compile_schema(SYNONYM)
+
+# File -> (compiled schema, whether the file has to exist)
+DATA_FILES = {
+    SYNONYMS_FILE: (compile_schema(SYNONYMS_SCHEMA), True),
+    NARRATIVES_FILE: (compile_schema(NARRATIVES_SCHEMA), False),
+    IMAGE_CREDITS_FILE: (compile_schema(IMAGE_CREDITS_SCHEMA), True),
+    METADATA_FILE: (compile_schema(AUDIO_METADATA_SCHEMA), False),
+}
+
+
+def validate_file(path):
+    """Parse and check one data file; returns (data or None, errors)"""
+    check, required = DATA_FILES[path]
+    name = path.name
+    if not path.exists():
+        return None, [f"{name}: file not found"] if required else []
+    try:
+        data = load_json(path)
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError) as error:
+        return None, [f"{name}: {error}"]
+    errors = []
+    check(data, name, errors)
+    return data, errors
+
+
+def is_valid(check, value):
+    errors = []
+    check(value, "", errors)
+    return not errors
+
+
+def valid_synonyms(synonyms):
+    """The entries of synonyms.json that pass the schema on their own"""
+    if not isinstance(synonyms, list):
+        return []
+    return [synonym for synonym in synonyms if is_valid(check_synonym, synonym)]
+
+
+def named_verbs(synonyms):
+    """The verb of every synonyms.json entry that has one, valid or not"""
+    if not isinstance(synonyms, list):
+        return []
+    return [synonym["verb"] for synonym in synonyms
+            if isinstance(synonym, dict) and isinstance(synonym.get("verb"), str)]
+
+
+def cross_references(synonyms, narratives, credits, voices):
+    """Errors in references between the data files, the images and the voices
+
+    Entries are followed only if they pass the schema, but every verb an
+    entry names counts as known, so one broken entry is reported once.
+    """
+    errors = []
+    verbs = named_verbs(synonyms)
+    for verb, count in Counter(verbs).items():
+        if count > 1:
+            errors.append(f"synonyms.json: verb {verb!r} appears {count} times")
+
+    images = credits.get("images", {}) if credits else {}
+    for synonym in valid_synonyms(synonyms):
+        verb = synonym["verb"]
+        if not (SITE_ROOT / synonym["image"]).is_file():
+            errors.append(f"synonyms.json: image of {verb!r} not found: {synonym['image']}")
+        if credits is not None:
+            if verb not in images:
+                errors.append(f"image_credits.json: no credit for {verb!r}")
+            elif not (SYNONYM_IMAGES_DIR / images[verb]["filename"]).is_file():
+                errors.append(f"image_credits.json: image of {verb!r} not found: "
+                              f"{images[verb]['filename']}")
+        voice = voice_for(verb)
+        if voice not in voices:
+            errors.append(f"build_config.py: unknown voice {voice!r} for {verb!r}")
+
+    for narrative in (narratives or {}).get("literaryNarratives", []):
+        if narrative["verb"] not in verbs:
+            errors.append(f"literary_narratives.json: narrative for unknown verb {narrative['verb']!r}")
+    return errors
+
+
+def validate_data(voices=EDGE_VOICES):
+    """Check every data file and the references between them
+
+    Returns {path: parsed data}; raises DataValidationError after printing
+    every error found.
+    """
+    paths = list(DATA_FILES)
+    with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+        results = dict(zip(paths, pool.map(validate_file, paths)))
+
+    errors = [error for _, file_errors in results.values() for error in file_errors]
+    # References are followed from every well-formed synonym, through the
+    # other files only if they are valid as a whole
+    valid = {path: data for path, (data, file_errors) in results.items() if not file_errors}
+    errors += cross_references(results[SYNONYMS_FILE][0],
+                               valid.get(NARRATIVES_FILE), valid.get(IMAGE_CREDITS_FILE), voices)
+
+    if errors:
+        for error in errors:
+            print(f"❌ {error}")
+        raise DataValidationError(errors)
+    print(f"✅ Data valid: {', '.join(path.name for path in paths if results[path][0] is not None)}")
+    return {path: data for path, (data, _) in results.items()}
+
+
+def main():
+    try:
+        validate_data()
+    except DataValidationError as error:
+        print(f"\n{error}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
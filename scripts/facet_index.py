@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Precomputed facet bitsets for the formality, region and context filters
+Each synonym's dense id is its position in synonyms.json, the same ids
+the search index uses. Every facet value gets a bitset of the ids having
+it, as 32-bit words (id i is bit i % 32 of word i // 32), plus its count,
+so the client combines filters with AND/OR over words and labels the
+filter options without iterating the data:
+
+    "size": 14,
+    "facets": {
+        "formality": {"formal": {"count": 10, "bits": [15286]}, ...},
+        "regions": {"general": {"count": 14, "bits": [16383]}},
+        "context": {...}
+    }
+
+Usage: python scripts/facet_index.py
+"""
+
+import json
+import sys
+
+from build_config import DATA_DIR, SYNONYMS_FILE
+from json_io import load_json, write_if_changed
+
+FACETS_FILE = DATA_DIR / "facets.json"
+
+# Facet name -> whether the synonym field holds a list of values
+FACET_FIELDS = {"formality": False, "regions": True, "context": False}
+
+
+def bitset(ids, size):
+    """The ids as a list of 32-bit words"""
+    words = [0] * ((size + 31) // 32)
+    for verb_id in ids:
+        words[verb_id // 32] |= 1 << (verb_id % 32)
+    return words
+
+
+def build_facets(synonyms):
+    """Bitset and count of every value of every facet"""
+    facets = {}
+    for name, is_list in FACET_FIELDS.items():
+        ids = {}
+        for verb_id, synonym in enumerate(synonyms):
+            values = synonym.get(name, []) if is_list else [synonym.get(name)]
+            for value in values:
+                if value:
+                    ids.setdefault(value, []).append(verb_id)
+        facets[name] = {value: {"count": len(ids[value]), "bits": bitset(ids[value], len(synonyms))}
+                        for value in sorted(ids)}
+    return {"size": len(synonyms), "facets": facets}
+
+
+def write_facets():
+    """Write data/facets.json from synonyms.json; return the facets"""
+    facets = build_facets(load_json(SYNONYMS_FILE))
+    text = json.dumps(facets, ensure_ascii=False, separators=(",", ":"))
+    if write_if_changed(FACETS_FILE, text.encode("utf-8")):
+        values = sum(len(facet) for facet in facets["facets"].values())
+        print(f"🏷️  Facets: {values} values over {facets['size']} verbs")
+    return facets
+
+
+def main():
+    write_facets()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Edge TTS read-aloud service
+Speaks enough of the websocket protocol for edge-tts to synthesize
+against it: speech.config and ssml requests in; turn.start, audio
+frames, audio.metadata word boundaries and turn.end out. Audio is the
+fake backend's silent MPEG frames, so clip lengths follow the text.
+
+Latency, jitter and an error rate (handshakes refused with 429, like
+throttling) are configurable, which makes it the target of the
+synthesis benchmarks.
+
+Usage: python scripts/fake_tts_server.py --port 8765 --latency 0.2 --error-rate 0.02
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import html
+import json
+import random
+import re
+import sys
+import uuid
+
+from tts_backends import FAKE_FRAME, FAKE_FRAME_SECONDS, FAKE_FRAMES_PER_CHUNK, FakeBackend
+
+WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x1, 0x2, 0x8, 0x9, 0xA
+
+SPEAK_TEXT = re.compile(r"<prosody[^>]*>(.*?)</prosody>", re.S)
+
+
+async def read_frame(reader):
+    """Read one client frame; return (opcode, payload)"""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length = int.from_bytes(await reader.readexactly(2), "big")
+    elif length == 127:
+        length = int.from_bytes(await reader.readexactly(8), "big")
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+    return first & 0x0F, payload
+
+
+def encode_frame(opcode, payload):
+    """A single unmasked server frame"""
+    length = len(payload)
+    if length < 126:
+        head = bytes([0x80 | opcode, length])
+    elif length < 1 << 16:
+        head = bytes([0x80 | opcode, 126]) + length.to_bytes(2, "big")
+    else:
+        head = bytes([0x80 | opcode, 127]) + length.to_bytes(8, "big")
+    return head + payload
+
+
+def text_message(request_id, path, body, content_type="application/json; charset=utf-8"):
+    headers = f"X-RequestId:{request_id}\r\nContent-Type:{content_type}\r\nPath:{path}\r\n\r\n"
+    return encode_frame(OP_TEXT, (headers + body).encode("utf-8"))
+
+
+def audio_message(request_id, data):
+    # Binary messages carry a 2-byte header length, the headers, then audio
+    headers = (f"X-RequestId:{request_id}\r\nContent-Type:audio/mpeg\r\n"
+               f"X-StreamId:{uuid.uuid4().hex}\r\nPath:audio\r\n").encode("ascii")
+    return encode_frame(OP_BINARY, len(headers).to_bytes(2, "big") + headers + data)
+
+
+def word_message(request_id, event):
+    metadata = {"Metadata": [{
+        "Type": "WordBoundary",
+        "Data": {
+            "Offset": event["offset"],
+            "Duration": event["duration"],
+            "text": {"Text": event["text"], "Length": len(event["text"]),
+                     "BoundaryType": "WordBoundary"}
+        }
+    }]}
+    return text_message(request_id, "audio.metadata", json.dumps(metadata))
+
+
+def parse_message(payload):
+    """Split a text message into (headers, body)"""
+    head, _, body = payload.decode("utf-8").partition("\r\n\r\n")
+    headers = dict(line.split(":", 1) for line in head.split("\r\n") if ":" in line)
+    return headers, body
+
+
+class FakeTTSServer:
+    """Serve edge-tts clients from the fake backend's audio"""
+
+    def __init__(self, latency=0.1, jitter=0.05, error_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.voice = FakeBackend()
+        self.requests = 0
+        self.refused = 0
+
+    async def handle(self, reader, writer):
+        try:
+            if await self.handshake(reader, writer):
+                await self.serve(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def handshake(self, reader, writer):
+        """Upgrade to a websocket, or refuse like a throttled service"""
+        request = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        headers = dict(line.split(":", 1) for line in request.split("\r\n")[1:] if ":" in line)
+        key = {name.strip().lower(): value.strip() for name, value in headers.items()}.get(
+            "sec-websocket-key", "")
+        self.requests += 1
+        if self.random.random() < self.error_rate:
+            self.refused += 1
+            writer.write(b"HTTP/1.1 429 Too Many Requests\r\nContent-Length: 0\r\n"
+                         b"Connection: close\r\n\r\n")
+            await writer.drain()
+            return False
+        accept = base64.b64encode(hashlib.sha1(key.encode("ascii") + WEBSOCKET_GUID).digest())
+        writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                     b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+        await writer.drain()
+        return True
+
+    async def serve(self, reader, writer):
+        while True:
+            opcode, payload = await read_frame(reader)
+            if opcode == OP_CLOSE:
+                writer.write(encode_frame(OP_CLOSE, payload[:2]))
+                await writer.drain()
+                return
+            if opcode == OP_PING:
+                writer.write(encode_frame(OP_PONG, payload))
+            elif opcode == OP_TEXT:
+                headers, body = parse_message(payload)
+                if headers.get("Path") == "ssml":
+                    await self.synthesize(writer, headers.get("X-RequestId", ""), body)
+
+    async def synthesize(self, writer, request_id, ssml):
+        """Answer one ssml request: turn.start, words, audio, turn.end"""
+        match = SPEAK_TEXT.search(ssml)
+        text = html.unescape(match.group(1)) if match else ""
+        delay = self.latency + self.random.uniform(-self.jitter, self.jitter)
+        await asyncio.sleep(max(0.0, delay))
+
+        writer.write(text_message(request_id, "turn.start",
+                                  json.dumps({"context": {"serviceTag": "fake"}})))
+        remaining = self.voice.frame_count(text)
+        for event in self.voice.word_boundaries(text, remaining * FAKE_FRAME_SECONDS):
+            writer.write(word_message(request_id, event))
+        while remaining:
+            frames = min(remaining, FAKE_FRAMES_PER_CHUNK)
+            writer.write(audio_message(request_id, FAKE_FRAME * frames))
+            remaining -= frames
+            await writer.drain()
+        writer.write(text_message(request_id, "turn.end", "{}"))
+        await writer.drain()
+
+
+async def serve(server, host, port, ready=None):
+    """Run the server until cancelled; ready(port) is called once it listens"""
+    listener = await asyncio.start_server(server.handle, host, port)
+    bound_port = listener.sockets[0].getsockname()[1]
+    if ready:
+        ready(bound_port)
+    async with listener:
+        await listener.serve_forever()
+
+
+def endpoint(host, port):
+    """URL to point edge-tts at a fake server"""
+    return f"ws://{host}:{port}/consumer/speech/synthesize/readaloud/edge/v1?TrustedClientToken=fake"
+
+
+def add_server_arguments(parser):
+    """Register the fake service's behaviour flags on an argparse parser"""
+    parser.add_argument("--latency", type=float, default=0.1,
+                        help="seconds before the first byte of every clip")
+    parser.add_argument("--jitter", type=float, default=0.05,
+                        help="uniform +/- variation of the latency, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of connections refused with 429")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="random seed for jitter and errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeTTSServer(args.latency, args.jitter, args.error_rate, args.seed)
+    # The endpoint line is read by the benchmark that spawned the server
+    ready = lambda port: print(endpoint(args.host, port), flush=True)
+    try:
+        asyncio.run(serve(server, args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
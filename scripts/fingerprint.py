@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Content-fingerprinted asset names for immutable caching
+Every asset the data files reference gets a copy named after its content
+(observar.mp3 -> observar.3f9a1c.mp3, hardlinked where possible), and
+the references in audio_metadata.json, synonyms.json and
+image_credits.json are rewritten to the fingerprinted names. Fingerprinted
+files can then be served with long-lived immutable cache headers.
+
+The build keeps reading and writing the plain names; a reference that is
+already fingerprinted is mapped back to its plain name first, so rerunning
+the step is idempotent. assets/fingerprints.json records the last build
+that used each fingerprinted file, and files unused for the given number
+of builds are pruned, so pages still holding older data files keep
+working. data_bundle.py keeps its detail shards the same way:
+
+    "fingerprints": {"build": 12, "files": {"assets/audio/verbs/observar.3f9a1c.mp3": 12, ...}},
+    "shards": {"build": 30, "files": {"data/verbs/observar.5d02be.json": 29, ...}}
+
+Usage: python scripts/fingerprint.py [--keep-builds 3]
+"""
+
+import argparse
+import hashlib
+import re
+import sys
+from pathlib import Path
+
+from build_config import (HERO_IMAGES_DIR, IMAGE_CREDITS_FILE, METADATA_FILE, SITE_ROOT,
+                          SYNONYM_IMAGES_DIR, SYNONYMS_FILE, site_path)
+from json_io import load_json, write_if_changed, write_json
+from metadata_store import MetadataStore
+from synthesis_cache import materialize
+
+ASSETS_DIR = SITE_ROOT / "assets"
+LEDGER_FILE = ASSETS_DIR / "fingerprints.json"
+DEFAULT_KEEP_BUILDS = 3
+
+FINGERPRINTED = re.compile(r"^(?P<stem>.+)\.[0-9a-f]{6}(?P<suffix>\.[A-Za-z0-9]+)$")
+ASSET_REFERENCE = re.compile(r'"(assets/[^"\\]+)"')
+
+
+def plain_name(name):
+    """File name with any fingerprint removed"""
+    match = FINGERPRINTED.match(name)
+    return f"{match['stem']}{match['suffix']}" if match else name
+
+
+def is_fingerprinted(path):
+    return FINGERPRINTED.match(Path(path).name) is not None
+
+
+def plain_reference(reference):
+    """Site path of the plain file behind a possibly fingerprinted reference"""
+    path = Path(reference)
+    return path.with_name(plain_name(path.name)).as_posix()
+
+
+def plain_references(value):
+    """Parsed JSON with every fingerprinted asset reference made plain again"""
+    if isinstance(value, dict):
+        return {key: plain_references(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [plain_references(item) for item in value]
+    if isinstance(value, str) and value.startswith("assets/"):
+        return plain_reference(value)
+    return value
+
+
+def image_directory(key):
+    """Where an image_credits.json filename lives: the hero or one per verb"""
+    return HERO_IMAGES_DIR if key == "hero" else SYNONYM_IMAGES_DIR
+
+
+class Ledger:
+    """One group of content-named files in assets/fingerprints.json
+
+    Each group counts its own builds, so fingerprinted files only age in
+    builds that fingerprint.
+    """
+
+    def __init__(self, group, path=LEDGER_FILE):
+        self.group = group
+        self.path = Path(path)
+
+    def prune(self, used, keep_builds=DEFAULT_KEEP_BUILDS, existing=()):
+        """Record the site paths this build used; delete files unused for keep_builds builds
+
+        existing files the ledger has not seen yet start aging now.
+        Compressed siblings are deleted with their file.
+        """
+        ledger = load_json(self.path) if self.path.exists() else {}
+        record = ledger.setdefault(self.group, {"build": 0, "files": {}})
+        build = record["build"] + 1
+        for name in existing:
+            record["files"].setdefault(name, build)
+        for name in used:
+            record["files"][name] = build
+        for name, last_used in sorted(record["files"].items()):
+            if last_used <= build - keep_builds:
+                path = SITE_ROOT / name
+                for suffix in ("", ".gz", ".br"):
+                    path.with_name(path.name + suffix).unlink(missing_ok=True)
+                del record["files"][name]
+                print(f"🗑️  Pruned unused {self.group} file: {name}")
+        record["build"] = build
+        write_json(self.path, ledger)
+
+
+class Fingerprinter:
+    """Create fingerprinted copies and rewrite references to them"""
+
+    def __init__(self):
+        self.current = {}   # plain site path -> fingerprinted site path
+
+    def reference(self, reference):
+        """Fingerprinted site path for an asset reference; others pass through"""
+        plain = plain_reference(reference)
+        path = SITE_ROOT / plain
+        if not plain.startswith("assets/") or not path.is_file():
+            return reference
+        if plain not in self.current:
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()[:6]
+            target = path.with_name(f"{path.stem}.{digest}{path.suffix}")
+            if not target.exists():
+                materialize(path, target)
+            self.current[plain] = site_path(target)
+        return self.current[plain]
+
+    def rewrite(self, value):
+        """Rewrite every asset reference in parsed JSON"""
+        if isinstance(value, dict):
+            return {key: self.rewrite(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.rewrite(item) for item in value]
+        if isinstance(value, str):
+            return self.reference(value)
+        return value
+
+    def rewrite_text(self, text):
+        """Rewrite asset references in JSON text, keeping its formatting"""
+        return ASSET_REFERENCE.sub(lambda match: f'"{self.reference(match[1])}"', text)
+
+    def rewrite_data_files(self):
+        """Point audio_metadata.json, synonyms.json and image_credits.json at fingerprints"""
+        with MetadataStore(METADATA_FILE).transaction() as audio_metadata:
+            rewritten = self.rewrite(audio_metadata)
+            audio_metadata.clear()
+            audio_metadata.update(rewritten)
+
+        # synonyms.json is edited by hand; only the references change
+        raw = SYNONYMS_FILE.read_bytes().decode("utf-8")
+        write_if_changed(SYNONYMS_FILE, self.rewrite_text(raw).encode("utf-8"))
+
+        if IMAGE_CREDITS_FILE.exists():
+            credits = load_json(IMAGE_CREDITS_FILE)
+            for key, credit in credits.get("images", {}).items():
+                plain = site_path(image_directory(key) / plain_name(credit["filename"]))
+                credit["filename"] = Path(self.reference(plain)).name
+            if credits != load_json(IMAGE_CREDITS_FILE):
+                write_json(IMAGE_CREDITS_FILE, credits)
+
+    def prune(self, keep_builds=DEFAULT_KEEP_BUILDS):
+        """Record this build's fingerprints and delete ones unused for keep_builds builds"""
+        Ledger("fingerprints").prune(self.current.values(), keep_builds)
+
+
+def fingerprint_assets(keep_builds=DEFAULT_KEEP_BUILDS):
+    """Fingerprint every referenced asset and rewrite the data files"""
+    fingerprinter = Fingerprinter()
+    fingerprinter.rewrite_data_files()
+    fingerprinter.prune(keep_builds)
+    print(f"🔖 Fingerprinted {len(fingerprinter.current)} assets")
+    return fingerprinter
+
+
+def add_fingerprint_arguments(parser):
+    """Register the fingerprinting flags on an argparse parser"""
+    parser.add_argument("--fingerprint", action="store_true",
+                        help="reference content-hashed copies of every asset from the data files")
+    parser.add_argument("--keep-builds", type=int, default=DEFAULT_KEEP_BUILDS,
+                        help="builds an unused fingerprinted file or detail shard survives "
+                             "(only fingerprinting builds count for fingerprinted files)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keep-builds", type=int, default=DEFAULT_KEEP_BUILDS)
+    args = parser.parse_args()
+    fingerprint_assets(args.keep_builds)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Incremental rebuild support for the audio generators
+Diffs the clips wanted by synonyms.json against what audio_metadata.json
+already records, so only added or edited text is synthesized again
+"""
+
+from pathlib import Path
+
+from fingerprint import is_fingerprinted
+from synthesis_cache import normalize_text
+
+# Every clip recorded before engines were was made with edge-tts
+UNRECORDED_ENGINE_PREFIX = "edge-"
+
+
+def recorded_entries(audio_metadata):
+    """Map each recorded clip file to its metadata entry"""
+    clips = {}
+
+    def record(entry):
+        clips[entry["file"]] = entry
+
+    for entry in audio_metadata.get("verbs", {}).values():
+        record(entry)
+    for entries in audio_metadata.get("examples", {}).values():
+        for entry in entries:
+            record(entry)
+    for narrative in audio_metadata.get("narratives", {}).values():
+        for entry in narrative["parts"]:
+            record(entry)
+    return clips
+
+
+def recorded_clips(audio_metadata):
+    """Map each recorded clip file to its (normalized text, voice, engine)"""
+    return {file: (normalize_text(entry["text"]), entry["voice"], entry.get("engine"))
+            for file, entry in recorded_entries(audio_metadata).items()}
+
+
+def carry_over(entries, audio_metadata, fields):
+    """Copy derived fields (word timings, ...) from unchanged recorded clips
+
+    Clips skipped by an incremental run keep what the previous run
+    measured for them, as long as their text and voice are the same.
+    """
+    recorded = recorded_entries(audio_metadata)
+    for entry in entries:
+        old = recorded.get(entry["file"])
+        if not old or normalize_text(old["text"]) != normalize_text(entry["text"]):
+            continue
+        if old["voice"] != entry["voice"]:
+            continue
+        for name in fields:
+            if name in old:
+                entry[name] = old[name]
+
+
+def same_engine(recorded, engine):
+    """Whether a clip's recorded engine is the given one
+
+    Entries without an engine predate its recording and count as made by
+    whichever edge-tts is in use.
+    """
+    if recorded is None:
+        return engine.startswith(UNRECORDED_ENGINE_PREFIX)
+    return recorded == engine
+
+
+def select_changed(jobs, audio_metadata, site_root, engine):
+    """Return the jobs whose text, voice or engine differs from the metadata
+
+    Clips another engine made (a fake or eSpeak build, an older edge-tts)
+    count as changed. A job is also kept when its file has gone missing
+    from disk, even if the metadata still describes it.
+    """
+    recorded = recorded_clips(audio_metadata)
+    changed = []
+    for job in jobs:
+        file = Path(job.output_path).relative_to(site_root).as_posix()
+        text, voice, recorded_engine = recorded.get(file, (None, None, None))
+        unchanged = (text == normalize_text(job.text) and voice == job.voice
+                     and same_engine(recorded_engine, engine))
+        if not unchanged or not job.output_path.exists():
+            changed.append(job)
+    return changed
+
+
+def remove_orphans(directory, pattern, wanted):
+    """Delete files in directory matching pattern that no job produces
+
+    Fingerprinted copies are left alone; fingerprint.py prunes them.
+    """
+    wanted = {Path(path).resolve() for path in wanted}
+    removed = []
+    for path in sorted(Path(directory).glob(pattern)):
+        if path.resolve() not in wanted and not is_fingerprinted(path):
+            path.unlink()
+            removed.append(path)
+            print(f"🗑️  Removed orphan: {path.name}")
+    return removed
+
+
+def add_incremental_arguments(parser):
+    """Register the --incremental flag on an argparse parser"""
+    parser.add_argument("--incremental", action="store_true",
+                        help="only synthesize clips whose text or voice changed "
+                             "and delete clips no entry uses any more")
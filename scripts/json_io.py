@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+JSON and file-writing helpers shared by the build scripts
+Data files stay readable (two-space indent) while integer arrays such as
+word timings are kept on a single line
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+
+def load_json(path):
+    """Parse a UTF-8 JSON file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def dumps_json(data):
+    """Indented JSON with every array of integers written on one line"""
+    compact = []
+
+    def mark(value):
+        if isinstance(value, dict):
+            return {key: mark(item) for key, item in value.items()}
+        if isinstance(value, list):
+            if value and all(type(item) is int for item in value):
+                compact.append(json.dumps(value, separators=(",", ":")))
+                return f"\0{len(compact) - 1}\0"
+            return [mark(item) for item in value]
+        return value
+
+    text = json.dumps(mark(data), indent=2, ensure_ascii=False)
+    return re.sub(r'"\\u0000(\d+)\\u0000"', lambda match: compact[int(match.group(1))], text)
+
+
+def write_json(path, data):
+    """Write data as JSON, replacing the file atomically"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(f".{path.name}.tmp")
+    with open(temp, 'w', encoding='utf-8') as f:
+        f.write(dumps_json(data))
+    os.replace(temp, path)
+
+
+def write_if_changed(path, data):
+    """Atomically write data unless the file already holds exactly that"""
+    path = Path(path)
+    if path.is_file() and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(f".{path.name}.tmp")
+    temp.write_bytes(data)
+    os.replace(temp, path)
+    return True
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Merge-safe store for audio_metadata.json
+Writers never replace the file with what they loaded at start-up. Under
+an exclusive lock the current file is read again, only the keys a run
+produced are merged into it, and the result is written atomically, and
+only if something changed. Partial rebuilds keep every section and entry
+they did not touch, and parallel runs cannot lose each other's updates.
+"""
+
+import copy
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from json_io import load_json, write_json
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Sections keyed by verb; a verb removed from synonyms.json leaves them
+VERB_SECTIONS = ("verbs", "examples", "narratives", "sprites")
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on path (created if needed) for the block"""
+    with open(path, 'a+b') as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def merge_sections(current, sections, prune=None):
+    """Merge sections into current key by key; return the merged copy
+
+    A key's value is replaced as a whole, so fields a clip no longer has
+    do not linger. Keys absent from a section are kept unless
+    prune(section name, key) says they are stale. Non-dict values
+    replace the old value.
+    """
+    merged = dict(current)
+    for name, section in sections.items():
+        old = current.get(name)
+        if not isinstance(section, dict) or not isinstance(old, dict):
+            merged[name] = section
+            continue
+        kept = {key: value for key, value in old.items()
+                if key in section or not (prune and prune(name, key))}
+        merged[name] = {**kept, **section}
+    return merged
+
+
+class MetadataStore:
+    """audio_metadata.json, updated in place under a file lock"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(f".{self.path.name}.lock")
+
+    def load(self):
+        return load_json(self.path) if self.path.exists() else {}
+
+    @contextmanager
+    def transaction(self):
+        """Yield the current metadata for editing; save it if it changed
+
+        The lock is held for the whole block, so keep it short.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.lock_path):
+            current = self.load()
+            data = copy.deepcopy(current)
+            yield data
+            self.changed = data != current
+            if self.changed:
+                data["generatedAt"] = datetime.utcnow().isoformat()
+                write_json(self.path, data)
+
+    def update(self, sections, prune=None):
+        """Merge sections into the file; return whether it was rewritten"""
+        with self.transaction() as data:
+            merged = merge_sections(data, sections, prune)
+            data.clear()
+            data.update(merged)
+        return self.changed
+
+
+def verb_pruner(verbs, dropped=()):
+    """prune() for merge_sections dropping verbs no longer in synonyms.json
+
+    dropped lists further (section, verb) entries to remove.
+    """
+    verbs = set(verbs)
+    dropped = set(dropped)
+    return lambda section, key: ((section in VERB_SECTIONS and key not in verbs)
+                                 or (section, key) in dropped)
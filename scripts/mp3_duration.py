@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Exact MP3 durations from frame headers, without decoding
+Reads the Xing/Info tag when the encoder wrote one (including LAME
+encoder delay and padding) and otherwise walks every frame header.
+Files are measured in parallel and results are cached by content hash.
+
+Usage: python scripts/mp3_duration.py   # fill durations into data/audio_metadata.json
+"""
+
+import hashlib
+import json
+import os
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from build_config import METADATA_FILE, SITE_ROOT
+from metadata_store import MetadataStore
+
+DEFAULT_CACHE_FILE = SITE_ROOT / ".cache" / "durations.json"
+
+# Bump when parsing changes so cached results are recomputed
+PARSER_VERSION = 1
+
+# kbit/s by (MPEG-1?, layer) and bitrate index; index 0 (free) and 15 are invalid
+BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# Hz by version bits: 0 = MPEG-2.5, 2 = MPEG-2, 3 = MPEG-1 (1 is reserved)
+SAMPLE_RATES = {
+    0: (11025, 12000, 8000),
+    2: (22050, 24000, 16000),
+    3: (44100, 48000, 32000),
+}
+
+
+@dataclass
+class FrameHeader:
+    """Decoded 4-byte MPEG audio frame header"""
+    mpeg1: bool
+    layer: int
+    bitrate: int
+    sample_rate: int
+    padding: int
+    mono: bool
+
+    @property
+    def samples(self):
+        if self.layer == 1:
+            return 384
+        if self.layer == 2 or self.mpeg1:
+            return 1152
+        return 576
+
+    @property
+    def length(self):
+        if self.layer == 1:
+            return (12 * self.bitrate * 1000 // self.sample_rate + self.padding) * 4
+        factor = 144 if self.layer == 2 or self.mpeg1 else 72
+        return factor * self.bitrate * 1000 // self.sample_rate + self.padding
+
+    @property
+    def side_info(self):
+        """Bytes of Layer III side information after the header"""
+        if self.mpeg1:
+            return 17 if self.mono else 32
+        return 9 if self.mono else 17
+
+
+@dataclass
+class Mp3Info:
+    """Frame-level facts about one MP3 stream"""
+    frames: int
+    samples_per_frame: int
+    sample_rate: int
+    encoder_delay: int = 0
+    encoder_padding: int = 0
+
+    @property
+    def samples(self):
+        return self.frames * self.samples_per_frame - self.encoder_delay - self.encoder_padding
+
+    @property
+    def duration(self):
+        return self.samples / self.sample_rate
+
+
+def parse_header(data, offset):
+    """Decode the frame header at offset, or return None if there is none"""
+    if offset + 4 > len(data):
+        return None
+    word, = struct.unpack_from(">I", data, offset)
+    if word >> 21 != 0x7FF:
+        return None
+    version = (word >> 19) & 0x3
+    layer = 4 - ((word >> 17) & 0x3)
+    bitrate_index = (word >> 12) & 0xF
+    rate_index = (word >> 10) & 0x3
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    mpeg1 = version == 3
+    return FrameHeader(
+        mpeg1=mpeg1,
+        layer=layer,
+        bitrate=BITRATES[(mpeg1, layer)][bitrate_index],
+        sample_rate=SAMPLE_RATES[version][rate_index],
+        padding=(word >> 9) & 0x1,
+        mono=((word >> 6) & 0x3) == 3,
+    )
+
+
+def skip_id3v2(data):
+    """Offset of the first byte after a leading ID3v2 tag"""
+    if data[:3] != b"ID3" or len(data) < 10:
+        return 0
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def audio_end(data):
+    """Offset where audio ends, ignoring a trailing ID3v1 tag"""
+    if len(data) >= 128 and data[-128:-125] == b"TAG":
+        return len(data) - 128
+    return len(data)
+
+
+def find_frame(data, offset, end):
+    """Offset and header of the next frame whose successor also syncs"""
+    while offset < end - 4:
+        offset = data.find(b"\xff", offset, end)
+        if offset < 0:
+            return -1, None
+        header = parse_header(data, offset)
+        if header:
+            following = offset + header.length
+            if following >= end or parse_header(data, following):
+                return offset, header
+        offset += 1
+    return -1, None
+
+
+def read_xing(data, offset, header):
+    """Return (frames, delay, padding) from a Xing/Info tag, or None"""
+    tag = offset + 4 + header.side_info
+    if data[tag:tag + 4] not in (b"Xing", b"Info"):
+        return None
+    flags, = struct.unpack_from(">I", data, tag + 4)
+    if not flags & 0x1:
+        return None
+    frames, = struct.unpack_from(">I", data, tag + 8)
+    cursor = tag + 12
+    cursor += 4 if flags & 0x2 else 0
+    cursor += 100 if flags & 0x4 else 0
+    cursor += 4 if flags & 0x8 else 0
+    delay = padding = 0
+    # LAME and ffmpeg append the gapless delay/padding 21 bytes into their tag
+    if data[cursor:cursor + 4] in (b"LAME", b"Lavf", b"Lavc", b"L3.9"):
+        packed = data[cursor + 21:cursor + 24]
+        if len(packed) == 3:
+            delay = (packed[0] << 4) | (packed[1] >> 4)
+            padding = ((packed[1] & 0x0F) << 8) | packed[2]
+    return frames, delay, padding
+
+
+def iter_frames(data):
+    """Yield (offset, header) for every audio frame, skipping tags and junk"""
+    end = audio_end(data)
+    offset, header = find_frame(data, skip_id3v2(data), end)
+    while header:
+        if offset + header.length > end:
+            return
+        yield offset, header
+        offset += header.length
+        header = parse_header(data, offset)
+        if not header:
+            offset, header = find_frame(data, offset, end)
+
+
+def parse_mp3(data):
+    """Mp3Info for an MP3 byte string"""
+    frames = iter_frames(data)
+    try:
+        offset, first = next(frames)
+    except StopIteration:
+        raise ValueError("no MPEG audio frames found")
+
+    xing = read_xing(data, offset, first)
+    if xing:
+        # The tag frame itself is silent and not counted in the total
+        count, delay, padding = xing
+        return Mp3Info(count, first.samples, first.sample_rate, delay, padding)
+    return Mp3Info(1 + sum(1 for _ in frames), first.samples, first.sample_rate)
+
+
+def measure_file(path):
+    """Mp3Info fields for one file, as a plain dict for the process pool"""
+    return asdict(parse_mp3(Path(path).read_bytes()))
+
+
+def file_digest(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def load_cache(cache_file):
+    if not cache_file.is_file():
+        return {}
+    with open(cache_file, 'r', encoding='utf-8') as f:
+        cache = json.load(f)
+    return cache if cache.get("version") == PARSER_VERSION else {}
+
+
+def save_cache(cache_file, cache):
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    temp = cache_file.with_suffix(".tmp")
+    with open(temp, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(temp, cache_file)
+
+
+def measure_durations(paths, cache_file=DEFAULT_CACHE_FILE, workers=None):
+    """Map each MP3 path to its Mp3Info, parsing only files not seen before"""
+    paths = [Path(path) for path in paths]
+    cache = load_cache(cache_file)
+    known = cache.setdefault("files", {})
+    cache["version"] = PARSER_VERSION
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        digests = dict(zip(paths, pool.map(file_digest, paths)))
+
+    missing = sorted({digest: path for path, digest in digests.items()
+                      if digest not in known}.items())
+    if missing:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            measured = pool.map(measure_file, [path for _, path in missing])
+            for (digest, _), info in zip(missing, measured):
+                known[digest] = info
+        save_cache(cache_file, cache)
+
+    return {path: Mp3Info(**known[digest]) for path, digest in digests.items()}
+
+
+def clip_entries(audio_metadata):
+    """Every clip entry in audio metadata: verbs, examples and narrative parts"""
+    yield from audio_metadata.get("verbs", {}).values()
+    for entries in audio_metadata.get("examples", {}).values():
+        yield from entries
+    for narrative in audio_metadata.get("narratives", {}).values():
+        yield from narrative["parts"]
+
+
+def apply_durations(audio_metadata, site_root, cache_file=DEFAULT_CACHE_FILE):
+    """Fill "duration" (seconds) for every clip in audio metadata that exists on disk"""
+    entries = [entry for entry in clip_entries(audio_metadata)
+               if (site_root / entry["file"]).is_file()]
+    durations = measure_durations([site_root / entry["file"] for entry in entries], cache_file)
+    for entry in entries:
+        entry["duration"] = round(durations[site_root / entry["file"]].duration, 3)
+    print(f"⏱️  Measured durations for {len(entries)} clips")
+    return audio_metadata
+
+
+def main():
+    with MetadataStore(METADATA_FILE).transaction() as audio_metadata:
+        apply_durations(audio_metadata, SITE_ROOT)
+    print(f"📝 Metadata updated: {METADATA_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
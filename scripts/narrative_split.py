@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Single-request narrative synthesis, split locally into parts
+A whole narrative is synthesized as one request, so it costs one
+connection and keeps its intonation across part boundaries. The stream is
+then cut into {verb}_part_{i}.mp3 at MP3 frame boundaries, in the pause
+between the last word of one part and the first word of the next, as
+located by the word-boundary timings.
+
+Edge TTS no longer accepts custom SSML, so bookmarks are not available;
+word boundaries serve the same purpose. A Layer III frame just after a
+cut may reference bit-reservoir bytes left in the previous part; decoders
+drop that one frame, which falls in the pause and is inaudible.
+"""
+
+from pathlib import Path
+
+from json_io import write_if_changed
+from mp3_duration import iter_frames, read_xing
+
+# Parts are joined on a line break, which the engine reads as a pause
+PART_SEPARATOR = "\n"
+
+
+def join_parts(texts):
+    """Text of the single request for a narrative"""
+    return PART_SEPARATOR.join(texts)
+
+
+def part_ranges(texts):
+    """(start, end) character range of each part in the joined text"""
+    ranges = []
+    start = 0
+    for text in texts:
+        ranges.append((start, start + len(text)))
+        start += len(text) + len(PART_SEPARATOR)
+    return ranges
+
+
+def cut_points(words, ranges):
+    """Time in ms to cut at between each pair of consecutive parts"""
+    cuts = []
+    for (_, end), (next_start, _) in zip(ranges, ranges[1:]):
+        before = [i for i, index in enumerate(words["index"]) if 0 <= index < end]
+        after = [i for i, index in enumerate(words["index"]) if index >= next_start]
+        if not before or not after:
+            raise ValueError("word boundaries do not cover every narrative part")
+        last, first = before[-1], after[0]
+        spoken_until = words["start"][last] + words["duration"][last]
+        cuts.append((spoken_until + words["start"][first]) / 2)
+    return cuts
+
+
+def part_words(words, part_range, offset_ms):
+    """Word timings of one part, relative to the part's own text and audio"""
+    start, end = part_range
+    selected = [i for i, index in enumerate(words["index"]) if start <= index < end]
+    return {
+        "start": [max(0, round(words["start"][i] - offset_ms)) for i in selected],
+        "duration": [words["duration"][i] for i in selected],
+        "index": [words["index"][i] - start for i in selected],
+        "length": [words["length"][i] for i in selected],
+    }
+
+
+def split_narrative(combined_path, words, part_jobs):
+    """Cut a synthesized narrative into its part files
+
+    Returns [(part output path, clip info)] in part order.
+    """
+    if not words:
+        raise ValueError("single-request narratives need word boundaries from the backend")
+    data = Path(combined_path).read_bytes()
+    frames = list(iter_frames(data))
+    if frames and read_xing(data, *frames[0]):
+        frames = frames[1:]
+    if not frames:
+        raise ValueError(f"no MPEG audio frames in {Path(combined_path).name}")
+    header = frames[0][1]
+    frame_ms = header.samples * 1000 / header.sample_rate
+
+    ranges = part_ranges([job.text for job in part_jobs])
+    boundaries = [0] + [round(cut / frame_ms) for cut in cut_points(words, ranges)] + [len(frames)]
+
+    clips = []
+    for job, part_range, first, last in zip(part_jobs, ranges, boundaries, boundaries[1:]):
+        body = b"".join(data[offset:offset + frame.length] for offset, frame in frames[first:last])
+        write_if_changed(job.output_path, body)
+        print(f"✂️  Split: {Path(job.output_path).name} ({last - first} frames)")
+        clips.append((job.output_path, {"words": part_words(words, part_range, first * frame_ms)}))
+    return clips
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Precompressed copies of the site's text assets
+Writes .gz (level 9) and .br (quality 11) siblings of the data, scripts
+and styles the browser downloads, so a static host can serve them
+without compressing on the fly. Files whose content hash is unchanged
+since the last run are skipped; the rest are compressed in parallel.
+
+Brotli needs the optional `brotli` package; without it only .gz is
+written. Original and compressed sizes go to a manifest for tracking the
+transfer budget:
+
+    "files": {
+        "data/synonyms.json": {"sha256": "...", "bytes": 41210, "gzip": 9624, "br": 8017}
+    },
+    "totals": {"bytes": ..., "gzip": ..., "br": ...}
+
+Usage: python scripts/precompress.py
+"""
+
+import gzip
+import hashlib
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from build_config import DATA_DIR, SITE_ROOT, site_path
+from json_io import load_json, write_if_changed, write_json
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Everything the browser fetches as text; audio and images are already compressed
+PRECOMPRESS_PATTERNS = (
+    "index.html",
+    "data/*.json",
+    "data/verbs/*.json",
+    "scripts/*.js",
+    "components/*.js",
+    "services/*.js",
+    "styles/*.css",
+)
+MANIFEST_FILE = DATA_DIR / "compression_manifest.json"
+SUFFIXES = {"gzip": "gz", "br": "br"}
+
+
+def formats():
+    """Compression formats available in this environment"""
+    return ["gzip", "br"] if brotli else ["gzip"]
+
+
+def sibling(path, name):
+    return path.with_name(f"{path.name}.{SUFFIXES[name]}")
+
+
+def precompress_targets(patterns=PRECOMPRESS_PATTERNS):
+    """Files to precompress, excluding the manifest itself"""
+    files = sorted({path for pattern in patterns for path in SITE_ROOT.glob(pattern)})
+    return [path for path in files if path.is_file() and path != MANIFEST_FILE]
+
+
+def compress_file(path):
+    """Write the .gz and .br siblings of one file; runs in a worker process"""
+    path = Path(path)
+    data = path.read_bytes()
+    # mtime=0 keeps the gzip output identical for identical input
+    compressed = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli:
+        compressed["br"] = brotli.compress(data, quality=11)
+    for name, body in compressed.items():
+        write_if_changed(sibling(path, name), body)
+    return {name: len(body) for name, body in compressed.items()}
+
+
+def up_to_date(path, digest, record):
+    """Whether the recorded siblings still belong to this content"""
+    if not record or record.get("sha256") != digest:
+        return False
+    return all(name in record and sibling(path, name).is_file() for name in formats())
+
+
+def load_manifest():
+    return load_json(MANIFEST_FILE) if MANIFEST_FILE.exists() else {}
+
+
+def precompress(paths, workers=None):
+    """Compress changed files in parallel and write the size manifest"""
+    old_manifest = load_manifest()
+    previous = old_manifest.get("files", {})
+    files = {}
+    changed = []
+    for path in paths:
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        record = previous.get(site_path(path))
+        if up_to_date(path, digest, record):
+            files[site_path(path)] = record
+        else:
+            files[site_path(path)] = {"sha256": digest, "bytes": path.stat().st_size}
+            changed.append(path)
+
+    if changed:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for path, sizes in zip(changed, pool.map(compress_file, changed)):
+                files[site_path(path)].update(sizes)
+                print(f"🗜️  Compressed: {site_path(path)} "
+                      f"({files[site_path(path)]['bytes']} → {sizes['gzip']} gz)")
+
+    totals = {name: sum(record.get(name, 0) for record in files.values())
+              for name in ["bytes", *formats()]}
+    manifest = {"files": files, "totals": totals}
+    old_manifest.pop("generatedAt", None)
+    if manifest != old_manifest:
+        write_json(MANIFEST_FILE, {"generatedAt": datetime.utcnow().isoformat(), **manifest})
+    print(f"📊 {len(files)} files, {len(changed)} compressed, "
+          f"{totals['bytes']} bytes → {totals['gzip']} gzip"
+          + (f", {totals['br']} brotli" if brotli else " (brotli not installed)"))
+    return manifest
+
+
+def add_precompress_arguments(parser):
+    """Register the --precompress flag on an argparse parser"""
+    parser.add_argument("--precompress", action="store_true",
+                        help="write .gz/.br siblings of the site's data, scripts and styles")
+
+
+def main():
+    precompress(precompress_targets())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
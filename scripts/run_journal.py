@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Checkpoint journal for resumable asset builds
+Every clip is appended to a JSON Lines journal as soon as it is finished,
+so an exception or Ctrl-C no longer loses the work of the clips that
+already succeeded. With --resume, journaled clips whose text, voice,
+engine and file still match are skipped and their metadata is rebuilt from the
+journal; only the remaining clips are synthesized.
+
+One line per event, later lines for a file updating earlier ones:
+
+    {"file": "assets/audio/verbs/observar.mp3", "stage": "synthesized",
+     "textHash": "9f2c...", "voice": "mx_female_1", "engine": "edge-6.1.9",
+     "bytes": 9792, "duration": 1.632, "words": {...}}
+    {"file": "assets/audio/verbs/observar.mp3", "stage": "postprocessed",
+     "leadMs": 48, "bytes": 9216, "duration": 1.536}
+
+The journal is removed once a build completes without failures.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from build_config import SITE_ROOT, site_path
+from mp3_duration import parse_mp3
+from synthesis_cache import normalize_text
+
+DEFAULT_JOURNAL = SITE_ROOT / ".cache" / "journal.jsonl"
+
+
+def text_hash(text):
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def clip_stats(path):
+    """(bytes, seconds) of a clip on disk; seconds is None if it does not parse"""
+    data = Path(path).read_bytes()
+    try:
+        duration = round(parse_mp3(data).duration, 3)
+    except ValueError:
+        duration = None
+    return len(data), duration
+
+
+class Journal:
+    """Append-only JSON Lines record of the clips a run has finished"""
+
+    def __init__(self, path=DEFAULT_JOURNAL):
+        self.path = Path(path)
+        self.file = None
+        self.resumed = 0
+
+    def load(self):
+        """Latest record per file; a line torn by a crash is ignored"""
+        records = {}
+        if not self.path.exists():
+            return records
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                records.setdefault(record["file"], {}).update(record)
+        return records
+
+    def open(self, resume=False):
+        """Start journaling, keeping earlier records only when resuming"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    def append(self, **record):
+        # Flushed per line: a crash loses at most the clip being written
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def record_synthesized(self, path, text, voice, engine, words):
+        size, duration = clip_stats(path)
+        self.append(file=site_path(path), stage="synthesized", textHash=text_hash(text),
+                    voice=voice, engine=engine, bytes=size, duration=duration, words=words)
+
+    def record_postprocessed(self, path, info):
+        size, duration = clip_stats(path)
+        self.append(file=site_path(path), stage="postprocessed", leadMs=info["leadMs"],
+                    bytes=size, duration=duration)
+
+    def split_completed(self, jobs, engine):
+        """Split jobs into ([(job, record)] already journaled by engine, jobs still to run)"""
+        records = self.load()
+        completed = []
+        remaining = []
+        for job in jobs:
+            record = records.get(site_path(job.output_path))
+            if record and self.matches(record, job, engine):
+                completed.append((job, record))
+            else:
+                remaining.append(job)
+        self.resumed = len(completed)
+        return completed, remaining
+
+    @staticmethod
+    def matches(record, job, engine):
+        """Whether a record still describes the job, the engine and the file on disk"""
+        path = Path(job.output_path)
+        return (record.get("textHash") == text_hash(job.text)
+                and record.get("voice") == job.voice
+                and record.get("engine") == engine
+                and path.is_file() and path.stat().st_size == record.get("bytes"))
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def clear(self):
+        """Remove the journal once its run has been fully written out"""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+def add_journal_arguments(parser):
+    """Register the --resume and --journal flags on an argparse parser"""
+    parser.add_argument("--resume", action="store_true",
+                        help="skip clips the journal of an interrupted run already finished")
+    parser.add_argument("--journal", type=Path, default=DEFAULT_JOURNAL,
+                        help=f"checkpoint journal (default: {site_path(DEFAULT_JOURNAL)})")
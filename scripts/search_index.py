@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Accent- and case-folded search index for the synonym search box
+Every word of a synonym's verb, definitions, examples, cultural notes and
+narratives (from synonyms.json and docs/literary_narratives.json) is
+folded ("Contempló" -> "contemplo") and mapped to the synonyms it occurs
+in. Tokens are sorted, so the client finds every token starting with a
+typed prefix by binary search instead of scanning the data:
+
+    "verbs": ["observar", "contemplar", ...],   # dense ids, synonyms.json order
+    "tokens": ["abajo", "acechar", ...],
+    "postings": [[3], [7, 12], ...]              # ids of the verbs using each token
+
+Usage: python scripts/search_index.py
+"""
+
+import json
+import re
+import sys
+import unicodedata
+
+from build_config import DATA_DIR, SITE_ROOT, SYNONYMS_FILE
+from json_io import load_json, write_if_changed
+
+SEARCH_INDEX_FILE = DATA_DIR / "search_index.json"
+NARRATIVES_FILE = SITE_ROOT / "docs" / "literary_narratives.json"
+
+SEARCHED_FIELDS = ("verb", "quickDefinition", "definition", "examples", "culturalNotes")
+TOKEN = re.compile(r"[^\W_]+")
+
+
+def fold(text):
+    """Lowercase text without accents; app.js folds queries the same way"""
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def tokens(text):
+    return TOKEN.findall(fold(text))
+
+
+def strings(value):
+    """Every string in a field, however deeply nested"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from strings(item)
+
+
+def load_narratives(path=NARRATIVES_FILE):
+    """verb -> narrativeExperience from the literary narratives document"""
+    if not path.exists():
+        return {}
+    return {narrative["verb"]: narrative["narrativeExperience"]
+            for narrative in load_json(path).get("literaryNarratives", [])}
+
+
+def build_search_index(synonyms, narratives):
+    """The inverted index over every searched field of every synonym"""
+    verbs = [synonym["verb"] for synonym in synonyms]
+    postings = {}
+    for verb_id, synonym in enumerate(synonyms):
+        texts = [text for field in SEARCHED_FIELDS for text in strings(synonym.get(field))]
+        texts += strings(synonym.get("narrativeExperience"))
+        texts += strings(narratives.get(synonym["verb"]))
+        for token in {token for text in texts for token in tokens(text)}:
+            postings.setdefault(token, []).append(verb_id)
+    ordered = sorted(postings)
+    return {"verbs": verbs, "tokens": ordered, "postings": [postings[token] for token in ordered]}
+
+
+def write_search_index():
+    """Write data/search_index.json from the current data; return the index"""
+    index = build_search_index(load_json(SYNONYMS_FILE), load_narratives())
+    text = json.dumps(index, ensure_ascii=False, separators=(",", ":"))
+    if write_if_changed(SEARCH_INDEX_FILE, text.encode("utf-8")):
+        print(f"🔎 Search index: {len(index['tokens'])} tokens over {len(index['verbs'])} verbs")
+    return index
+
+
+def main():
+    write_search_index()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Service worker and precache manifest for offline use
+Walks the asset graph from index.html: the files it links, the modules
+and data the scripts import or fetch, the detail shards data/bundle.json
+points to, the images named by synonyms.json and image_credits.json and
+the audio in audio_metadata.json. Every file
+gets a content-hash revision in precache-manifest.json, and sw.js is
+regenerated from scripts/templates/sw.js with a version derived from the
+manifest, so browsers pick up a new worker exactly when an asset changed
+and download only the files whose revision changed.
+
+Audio that has several encodings is listed as alternatives, smallest
+first; the worker precaches the first one the browser can play:
+
+    "entries": [{"url": "index.html", "revision": "3f9a0c1e5b7d2a64"}, ...],
+    "audio": [[{"url": "assets/audio/sprites/observar.webm", "type": "audio/webm; codecs=\"opus\"",
+                "revision": "..."}, {"url": "assets/audio/sprites/observar.mp3", ...}], ...]
+
+Usage: python scripts/service_worker.py
+"""
+
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+from build_config import IMAGE_CREDITS_FILE, METADATA_FILE, SITE_ROOT, SYNONYMS_FILE, site_path
+from data_bundle import BUNDLE_FILE
+from fingerprint import image_directory
+from json_io import load_json, write_if_changed, write_json
+from mp3_duration import clip_entries
+
+TEMPLATE_FILE = Path(__file__).parent / "templates" / "sw.js"
+SERVICE_WORKER_FILE = SITE_ROOT / "sw.js"
+MANIFEST_FILE = SITE_ROOT / "precache-manifest.json"
+ENTRY_PAGE = SITE_ROOT / "index.html"
+
+HTML_REFERENCE = re.compile(r'(?:href|src)="([^"]+)"')
+MODULE_REFERENCE = re.compile(r"""(?:import\s*\(|from)\s*['"]([^'"]+)['"]""")
+FETCH_REFERENCE = re.compile(r"""fetch\(\s*['"]([^'"]+)['"]""")
+
+
+def revision(path):
+    """Content hash identifying one version of a file"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+
+
+def local_file(base, reference):
+    """The site file a relative reference points to, or None"""
+    if not reference or re.match(r"^[a-z]+:|^//|^#", reference):
+        return None
+    path = (base / reference.split("?")[0].split("#")[0]).resolve()
+    if not path.is_file() or SITE_ROOT.resolve() not in path.parents:
+        return None
+    return path
+
+
+def shell_files():
+    """index.html and everything reachable from it through links, imports and fetches"""
+    root = SITE_ROOT.resolve()
+    found = []
+    queue = [ENTRY_PAGE.resolve()]
+    while queue:
+        path = queue.pop(0)
+        if path in found:
+            continue
+        found.append(path)
+        text = path.read_text(encoding="utf-8")
+        if path.suffix == ".html":
+            references = [(path.parent, ref) for ref in HTML_REFERENCE.findall(text)]
+        elif path.suffix == ".js":
+            # Modules resolve against the importing file, fetches against the page
+            references = [(path.parent, ref) for ref in MODULE_REFERENCE.findall(text)]
+            references += [(root, ref) for ref in FETCH_REFERENCE.findall(text)]
+        else:
+            references = []
+        for base, reference in references:
+            target = local_file(base, reference)
+            if target and target.suffix in (".html", ".js", ".css", ".json"):
+                queue.append(target)
+    return [SITE_ROOT / path.relative_to(root) for path in found]
+
+
+def detail_files():
+    """The per-verb detail shards the page fetches when a card opens"""
+    if not BUNDLE_FILE.exists():
+        return []
+    paths = [SITE_ROOT / entry["detail"] for entry in load_json(BUNDLE_FILE)["verbs"].values()
+             if entry.get("detail")]
+    return [path for path in paths if path.is_file()]
+
+
+def image_files():
+    """Images named by synonyms.json and image_credits.json"""
+    paths = [SITE_ROOT / synonym["image"] for synonym in load_json(SYNONYMS_FILE)
+             if synonym.get("image")]
+    if IMAGE_CREDITS_FILE.exists():
+        for key, credit in load_json(IMAGE_CREDITS_FILE).get("images", {}).items():
+            paths.append(image_directory(key) / credit["filename"])
+    return [path for path in dict.fromkeys(paths) if path.is_file()]
+
+
+def audio_alternatives(audio_metadata):
+    """One list of alternatives per audio file the client plays
+
+    Clips packed into a sprite are played from the sprite, so only the
+    sprite is precached for them.
+    """
+    sprites = list(audio_metadata.get("sprites", {}).values())
+    in_sprites = {clip for sprite in sprites for clip in sprite["clips"]}
+    playable = sprites + [entry for entry in clip_entries(audio_metadata)
+                          if entry["file"] not in in_sprites]
+    groups = []
+    for entry in playable:
+        sources = entry.get("sources") or [{"file": entry["file"], "type": "audio/mpeg"}]
+        group = [{"url": source["file"], "type": source["type"],
+                  "revision": revision(SITE_ROOT / source["file"])}
+                 for source in sources if (SITE_ROOT / source["file"]).is_file()]
+        if group:
+            groups.append(group)
+    return groups
+
+
+def build_manifest():
+    """The precache manifest for the current tree"""
+    files = shell_files() + detail_files() + image_files()
+    audio_metadata = load_json(METADATA_FILE) if METADATA_FILE.exists() else {}
+    entries = [{"url": site_path(path), "revision": revision(path)}
+               for path in dict.fromkeys(files)]
+    return {"entries": entries, "audio": audio_alternatives(audio_metadata)}
+
+
+def manifest_version(manifest):
+    return hashlib.sha256(json.dumps(manifest, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def write_service_worker():
+    """Write precache-manifest.json and sw.js; return the manifest"""
+    manifest = build_manifest()
+    version = manifest_version(manifest)
+    old = load_json(MANIFEST_FILE) if MANIFEST_FILE.exists() else {}
+    if old.get("version") != version:
+        write_json(MANIFEST_FILE, {"version": version, **manifest})
+    script = TEMPLATE_FILE.read_text(encoding="utf-8").replace("__PRECACHE_VERSION__", version)
+    if write_if_changed(SERVICE_WORKER_FILE, script.encode("utf-8")):
+        print(f"📦 Service worker {version}: {len(manifest['entries'])} files, "
+              f"{len(manifest['audio'])} audio files")
+    return manifest
+
+
+def add_service_worker_arguments(parser):
+    """Register the --no-service-worker flag on an argparse parser"""
+    parser.add_argument("--no-service-worker", action="store_true",
+                        help="do not regenerate sw.js and precache-manifest.json")
+
+
+def main():
+    write_service_worker()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
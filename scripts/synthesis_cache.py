@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache for synthesized clips
+A clip is keyed by its normalized text, the engine voice name, the output
+format and the engine version, so reruns only pay for text that changed
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import unicodedata
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / ".cache" / "tts"
+
+# Edge TTS default output; part of the key so a format change never
+# serves clips encoded the old way
+OUTPUT_FORMAT = "audio-24khz-48kbitrate-mono-mp3"
+
+
+def normalize_text(text):
+    """Normalize text the way it should be compared, not the way it is spoken"""
+    text = unicodedata.normalize("NFC", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def clip_key(text, voice_name, output_format=OUTPUT_FORMAT, engine_version=""):
+    """Stable hex digest identifying one synthesized clip"""
+    payload = json.dumps([normalize_text(text), voice_name, output_format, engine_version],
+                         ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def materialize(source, destination):
+    """Place `source` at `destination` by hardlink, falling back to a copy
+
+    The link or copy is made next to the destination and renamed over it,
+    so readers never observe a half-written file. Writers must replace
+    outputs rather than edit them in place, or the cache entry changes too.
+    """
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    temp = destination.with_name(f".{destination.name}.link")
+    if temp.exists():
+        temp.unlink()
+    try:
+        os.link(source, temp)
+    except OSError:
+        shutil.copyfile(source, temp)
+    os.replace(temp, destination)
+
+
+class SynthesisCache:
+    """Directory of clips addressed by clip_key, sharded by key prefix"""
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, engine_version="", output_format=OUTPUT_FORMAT):
+        self.root = Path(root)
+        self.engine_version = engine_version
+        self.output_format = output_format
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text, voice_name):
+        return clip_key(text, voice_name, self.output_format, self.engine_version)
+
+    def path_for(self, key):
+        return self.root / key[:2] / f"{key}.mp3"
+
+    def info_path_for(self, key):
+        return self.root / key[:2] / f"{key}.json"
+
+    def fetch(self, key, destination):
+        """Materialize a cached clip at destination and return its clip info
+
+        Returns None on a miss. Clip info is whatever the wrapped
+        synthesize function returned (word timings, ...), stored beside
+        the audio so a cache hit loses nothing a fresh synthesis has.
+        """
+        cached = self.path_for(key)
+        if not cached.is_file():
+            self.misses += 1
+            return None
+        materialize(cached, destination)
+        self.hits += 1
+        info_path = self.info_path_for(key)
+        if not info_path.is_file():
+            return {}
+        with open(info_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def store(self, key, source, info=None):
+        """Add a freshly synthesized clip and its clip info to the cache"""
+        cached = self.path_for(key)
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        if info:
+            info_path = self.info_path_for(key)
+            temp = info_path.with_suffix(".tmp")
+            with open(temp, 'w', encoding='utf-8') as f:
+                json.dump(info, f, ensure_ascii=False)
+            os.replace(temp, info_path)
+        if cached.is_file():
+            return
+        temp = cached.with_suffix(".tmp")
+        shutil.copyfile(source, temp)
+        os.replace(temp, cached)
+
+    def wrap(self, synthesize, voice_name):
+        """Wrap a synthesize(text, output_path, voice) coroutine with the cache
+
+        The coroutine returns a JSON-serializable clip info dict.
+        `voice_name` maps a voice id to the engine voice name that goes
+        into the key.
+        """
+        async def cached_synthesize(text, output_path, voice):
+            key = self.key(text, voice_name(voice))
+            info = self.fetch(key, output_path)
+            if info is not None:
+                print(f"♻️  Cached: {Path(output_path).name} ({voice})")
+                return info
+            info = await synthesize(text, output_path, voice)
+            self.store(key, output_path, info)
+            return info
+
+        return cached_synthesize
+
+    def print_summary(self):
+        print(f"   - {self.hits} clips served from cache, {self.misses} synthesized")
+
+
+def add_cache_arguments(parser):
+    """Register the shared cache flags on an argparse parser"""
+    parser.add_argument("--no-cache", action="store_true",
+                        help="synthesize every clip even if it is cached")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR,
+                        help="directory holding cached clips")
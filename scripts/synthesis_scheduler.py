@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Bounded-concurrency scheduler for TTS synthesis jobs
+Caps total and per-voice requests, retries each clip with jittered
+backoff and collects failures without cancelling the clips that succeeded
+"""
+
+import asyncio
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from build_trace import tracer
+
+# Defaults tuned for Edge TTS: enough parallelism to keep the pipe busy,
+# few enough connections per voice to stay clear of throttling
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PER_VOICE = 2
+DEFAULT_ATTEMPTS = 4
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 30.0
+
+
+@dataclass
+class SynthesisJob:
+    """One clip to synthesize: text spoken by a voice into output_path"""
+    text: str
+    output_path: Path
+    voice: str
+
+
+@dataclass
+class JobFailure:
+    """A job that exhausted its retries"""
+    job: SynthesisJob
+    attempts: int
+    error: BaseException
+
+
+@dataclass
+class SchedulerReport:
+    """Outcome of a scheduler run"""
+    succeeded: list = field(default_factory=list)
+    failed: list = field(default_factory=list)
+    retries: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self):
+        return not self.failed
+
+    def print_summary(self):
+        """Print a short run summary, listing every failed clip"""
+        print(f"\n⏱️  {len(self.succeeded)} clips in {self.elapsed:.1f}s "
+              f"({self.retries} retries)")
+        if not self.failed:
+            return
+        print(f"\n❌ {len(self.failed)} clips failed:")
+        for failure in self.failed:
+            job = failure.job
+            print(f"   - {job.output_path.name} ({job.voice}) after "
+                  f"{failure.attempts} attempts: {failure.error!r}")
+
+
+class SynthesisScheduler:
+    """Run synthesis jobs under a global and a per-voice concurrency cap"""
+
+    def __init__(self, synthesize, concurrency=DEFAULT_CONCURRENCY,
+                 per_voice=DEFAULT_PER_VOICE, attempts=DEFAULT_ATTEMPTS,
+                 base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY):
+        if concurrency < 1 or per_voice < 1 or attempts < 1:
+            raise ValueError("concurrency, per_voice and attempts must be >= 1")
+        self.synthesize = synthesize
+        self.concurrency = concurrency
+        self.per_voice = per_voice
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt):
+        """Full-jitter exponential backoff before retry number `attempt`"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    async def run(self, jobs, on_success=None):
+        """Run every job and return a SchedulerReport
+
+        `on_success(job, result)` is called as each clip completes, so
+        downstream work can start before the whole batch is done.
+        """
+        report = SchedulerReport()
+        global_slots = asyncio.Semaphore(self.concurrency)
+        voice_slots = defaultdict(lambda: asyncio.Semaphore(self.per_voice))
+        started = time.perf_counter()
+
+        async def run_job(job):
+            for attempt in range(1, self.attempts + 1):
+                queued = time.perf_counter()
+                # Slots are held only while a request is in flight, never
+                # while backing off, so one flaky voice cannot starve the rest
+                async with voice_slots[job.voice], global_slots:
+                    with tracer.clip(job.output_path.name, queued_since=queued,
+                                     voice=job.voice, attempt=attempt):
+                        try:
+                            result = await self.synthesize(job.text, job.output_path, job.voice)
+                        except asyncio.CancelledError:
+                            raise
+                        except Exception as error:
+                            last_error = error
+                        else:
+                            report.succeeded.append((job, result))
+                            if on_success:
+                                on_success(job, result)
+                            return
+                if attempt < self.attempts:
+                    report.retries += 1
+                    await asyncio.sleep(self.backoff(attempt))
+            report.failed.append(JobFailure(job, self.attempts, last_error))
+
+        await asyncio.gather(*(run_job(job) for job in jobs))
+        report.elapsed = time.perf_counter() - started
+        return report
+
+
+def add_scheduler_arguments(parser):
+    """Register the shared scheduler flags on an argparse parser"""
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="maximum clips synthesized at once")
+    parser.add_argument("--per-voice", type=int, default=DEFAULT_PER_VOICE,
+                        help="maximum concurrent clips per voice")
+    parser.add_argument("--attempts", type=int, default=DEFAULT_ATTEMPTS,
+                        help="attempts per clip before it is reported as failed")
+
+
+def scheduler_from_args(synthesize, args):
+    """Build a scheduler from parsed command-line flags"""
+    return SynthesisScheduler(synthesize, concurrency=args.concurrency,
+                              per_voice=args.per_voice, attempts=args.attempts)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Text-to-speech backends for the audio generators
+Each backend maps the shared voice ids (mx_female_1, ...) to its own
+voices, so the same build runs against Edge TTS, an offline local
+synthesizer or a deterministic fake for CI and benchmarks
+"""
+
+import asyncio
+import os
+import re
+import shutil
+import subprocess
+
+from audio_writer import write_stream
+
+# LATAM Spanish voices (Microsoft Edge TTS)
+# Using variety of voices from different regions and genders
+EDGE_VOICES = {
+    # Mexican voices
+    "mx_female_1": "es-MX-DaliaNeural",      # Mexican female (warm)
+    "mx_male_1": "es-MX-JorgeNeural",        # Mexican male (clear)
+
+    # Colombian voices
+    "co_female_1": "es-CO-SalomeNeural",     # Colombian female (gentle)
+    "co_male_1": "es-CO-GonzaloNeural",      # Colombian male (professional)
+
+    # Argentine voices
+    "ar_female_1": "es-AR-ElenaNeural",      # Argentine female (expressive)
+    "ar_male_1": "es-AR-TomasNeural",        # Argentine male (sophisticated)
+
+    # US Spanish (neutral LATAM)
+    "us_female_1": "es-US-PalomaNeural",     # US Spanish female (neutral)
+    "us_male_1": "es-US-AlonsoNeural",       # US Spanish male (neutral)
+}
+
+# eSpeak NG has a single Latin American Spanish voice; regions and
+# genders are approximated with its voice variants
+LOCAL_VOICES = {
+    "mx_female_1": "es-419+f3",
+    "mx_male_1": "es-419+m3",
+    "co_female_1": "es-419+f2",
+    "co_male_1": "es-419+m2",
+    "ar_female_1": "es-419+f4",
+    "ar_male_1": "es-419+m4",
+    "us_female_1": "es-419+f1",
+    "us_male_1": "es-419+m1",
+}
+
+# One silent MPEG-2 Layer III frame: 24 kHz, 48 kbit/s, mono, 24 ms.
+# Same stream parameters as the Edge TTS default output format
+FAKE_FRAME = b"\xff\xf3\x64\xc4" + bytes(140)
+FAKE_FRAME_SECONDS = 0.024
+FAKE_FRAMES_PER_CHUNK = 32
+
+# Read size for encoder output piped back from a subprocess
+PIPE_CHUNK_SIZE = 16 * 1024
+
+
+def import_edge_tts():
+    """Import edge_tts, installing it on first use"""
+    try:
+        import edge_tts
+    except ImportError:
+        print("Installing edge-tts...")
+        os.system("pip install edge-tts")
+        import edge_tts
+    return edge_tts
+
+
+class TTSBackend:
+    """Base class: stream MP3 audio for text spoken by a voice id
+
+    Backends implement stream() as an async generator of Edge-style
+    chunks ({"type": "audio", "data": bytes}, optionally interleaved with
+    {"type": "WordBoundary", ...} events); synthesize() writes that stream
+    to disk atomically without holding the whole clip in memory.
+    """
+
+    name = None
+    voices = {}
+    # Whether stream() reports WordBoundary events
+    reports_words = False
+    # Whether its voice names belong in audio_metadata.json; stand-in
+    # engines leave the published voices alone
+    records_voices = False
+
+    def voice_name(self, voice_id):
+        """Engine voice used for a shared voice id"""
+        return self.voices[voice_id]
+
+    @property
+    def engine_version(self):
+        """Identifies the engine build; part of every cache key"""
+        raise NotImplementedError
+
+    def stream(self, text, voice_id):
+        raise NotImplementedError
+
+    async def synthesize(self, text, output_path, voice_id):
+        """Synthesize one clip to output_path and return the StreamResult"""
+        return await write_stream(self.stream(text, voice_id), output_path)
+
+
+class EdgeBackend(TTSBackend):
+    """Microsoft Edge neural voices over the network"""
+
+    name = "edge"
+    voices = EDGE_VOICES
+    reports_words = True
+    records_voices = True
+
+    def __init__(self, endpoint=None):
+        self.edge_tts = import_edge_tts()
+        if endpoint:
+            # edge-tts has no endpoint option; point its module constant at
+            # a stand-in service such as scripts/fake_tts_server.py
+            self.edge_tts.communicate.WSS_URL = endpoint
+
+    @property
+    def engine_version(self):
+        return f"edge-{self.edge_tts.__version__}"
+
+    async def stream(self, text, voice_id):
+        voice = self.voice_name(voice_id)
+        try:
+            # edge-tts 7 reports sentence boundaries unless asked for words
+            communicate = self.edge_tts.Communicate(text, voice, boundary="WordBoundary")
+        except TypeError:
+            communicate = self.edge_tts.Communicate(text, voice)
+        async for chunk in communicate.stream():
+            yield chunk
+
+    async def list_voices(self):
+        return await self.edge_tts.list_voices()
+
+
+class LocalBackend(TTSBackend):
+    """Offline synthesis with eSpeak NG, encoded to MP3 with ffmpeg"""
+
+    name = "local"
+    voices = LOCAL_VOICES
+
+    def __init__(self):
+        self.espeak = shutil.which("espeak-ng") or shutil.which("espeak")
+        self.ffmpeg = shutil.which("ffmpeg")
+        if not self.espeak or not self.ffmpeg:
+            raise RuntimeError("the local backend needs espeak-ng and ffmpeg on PATH")
+        self._version = None
+
+    @property
+    def engine_version(self):
+        if self._version is None:
+            output = subprocess.run([self.espeak, "--version"], capture_output=True, text=True)
+            self._version = f"local-{output.stdout.strip()}"
+        return self._version
+
+    async def stream(self, text, voice_id):
+        # eSpeak's WAV goes through an OS pipe straight into ffmpeg, never
+        # through this process, so long narratives are not held in memory
+        wav_out, wav_in = os.pipe()
+        processes = []
+        try:
+            processes.append(await asyncio.create_subprocess_exec(
+                self.espeak, "-v", self.voice_name(voice_id), "--stdout", text,
+                stdout=wav_in, stderr=asyncio.subprocess.PIPE))
+            # Match the Edge TTS stream: 24 kHz mono MP3 at 48 kbit/s
+            processes.append(await asyncio.create_subprocess_exec(
+                self.ffmpeg, "-loglevel", "error", "-f", "wav", "-i", "pipe:0",
+                "-ac", "1", "-ar", "24000", "-b:a", "48k", "-f", "mp3", "pipe:1",
+                stdin=wav_out, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE))
+        except BaseException:
+            for process in processes:
+                process.kill()
+            raise
+        finally:
+            # The children hold their own copies of the pipe ends
+            os.close(wav_out)
+            os.close(wav_in)
+        speak, encode = processes
+
+        finished = False
+        try:
+            while chunk := await encode.stdout.read(PIPE_CHUNK_SIZE):
+                yield {"type": "audio", "data": chunk}
+            finished = True
+        finally:
+            if not finished:
+                for process in processes:
+                    if process.returncode is None:
+                        process.kill()
+            speak_errors = await speak.stderr.read()
+            errors = await encode.stderr.read()
+            await speak.wait()
+            await encode.wait()
+        if speak.returncode != 0:
+            raise RuntimeError(f"espeak failed: {speak_errors.decode(errors='replace').strip()}")
+        if encode.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {errors.decode(errors='replace').strip()}")
+
+
+class FakeBackend(TTSBackend):
+    """Deterministic silent clips whose length follows the text, for CI and benchmarks
+
+    Word boundaries are spread over the clip in proportion to word length.
+    """
+
+    name = "fake"
+    voices = {voice_id: voice_id for voice_id in EDGE_VOICES}
+    reports_words = True
+
+    def __init__(self, latency=0.0, seconds_per_char=0.065, min_seconds=0.4):
+        self.latency = latency
+        self.seconds_per_char = seconds_per_char
+        self.min_seconds = min_seconds
+
+    @property
+    def engine_version(self):
+        return "fake-1"
+
+    def frame_count(self, text):
+        seconds = max(self.min_seconds, len(text) * self.seconds_per_char)
+        return round(seconds / FAKE_FRAME_SECONDS)
+
+    def word_boundaries(self, text, seconds):
+        """WordBoundary events in 100 ns ticks, as Edge TTS reports them"""
+        words = re.findall(r"\w+", text)
+        total = sum(len(word) + 1 for word in words) or 1
+        ticks_per_char = seconds * 10_000_000 / total
+        offset = 0
+        for word in words:
+            duration = round(len(word) * ticks_per_char)
+            yield {"type": "WordBoundary", "offset": offset, "duration": duration, "text": word}
+            offset += round((len(word) + 1) * ticks_per_char)
+
+    async def stream(self, text, voice_id):
+        self.voice_name(voice_id)  # unknown voices fail like they would for real
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        remaining = self.frame_count(text)
+        for event in self.word_boundaries(text, remaining * FAKE_FRAME_SECONDS):
+            yield event
+        while remaining:
+            frames = min(remaining, FAKE_FRAMES_PER_CHUNK)
+            yield {"type": "audio", "data": FAKE_FRAME * frames}
+            remaining -= frames
+
+
+BACKENDS = {
+    "edge": EdgeBackend,
+    "local": LocalBackend,
+    "fake": FakeBackend,
+}
+
+
+def create_backend(name):
+    """Instantiate a backend by name"""
+    return BACKENDS[name]()
+
+
+def add_backend_arguments(parser):
+    """Register the --backend flag on an argparse parser"""
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="edge",
+                        help="speech engine: edge (network), local (offline) or fake (CI)")
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Word-boundary timings for synced highlighting
+Edge TTS reports a WordBoundary event per spoken word; they are stored in
+audio_metadata.json as parallel integer arrays instead of one object per
+word:
+
+    "words": {
+        "start":    [0, 412, ...],   # ms from the start of the clip
+        "duration": [380, 290, ...], # ms the word is spoken for
+        "index":    [0, 4, ...],     # character offset of the word in "text"
+        "length":   [3, 11, ...]     # characters the word spans in "text"
+    }
+
+An index of -1 means the spoken word could not be located in the text.
+"""
+
+# Edge TTS offsets and durations are in 100-nanosecond ticks
+TICKS_PER_MS = 10_000
+
+
+def encode_word_timings(events, text):
+    """Encode WordBoundary events as parallel arrays, or None if there are none"""
+    timings = {"start": [], "duration": [], "index": [], "length": []}
+    cursor = 0
+    for event in events:
+        if event["type"] != "WordBoundary":
+            continue
+        word = event["text"]
+        position = text.find(word, cursor)
+        if position >= 0:
+            cursor = position + len(word)
+        timings["start"].append(round(event["offset"] / TICKS_PER_MS))
+        timings["duration"].append(round(event["duration"] / TICKS_PER_MS))
+        timings["index"].append(position)
+        timings["length"].append(len(word))
+    return timings if timings["start"] else None
@@ -0,0 +1,113 @@
+/**
+ * Sinónimos de Ver - Service Worker
+ * Generated by scripts/service_worker.py from scripts/templates/sw.js; do not edit sw.js
+ *
+ * Precaches every asset listed in precache-manifest.json. Cache keys carry
+ * each file's content revision, so after a deploy only changed files are
+ * downloaded again and files no longer listed are dropped.
+ */
+
+const VERSION = '77acade19cf61c92';
+const CACHE_NAME = 'sinonimos-precache';
+const MANIFEST_URL = `precache-manifest.json?v=${VERSION}`;
+
+// Audio types this browser plays, passed by the page when registering
+const AUDIO_TYPES = (new URL(self.location).searchParams.get('audio') || 'audio/mpeg').split(',');
+
+let precacheIndex = null;
+
+function absoluteUrl(url) {
+    return new URL(url, self.registration.scope).href;
+}
+
+function cacheKey(entry) {
+    return `${absoluteUrl(entry.url)}?__rev=${entry.revision}`;
+}
+
+// Every file to precache; for audio, the smallest alternative this browser plays
+function selectEntries(manifest) {
+    const audio = manifest.audio.map(alternatives =>
+        alternatives.find(entry => AUDIO_TYPES.includes(entry.type)) ||
+        alternatives.find(entry => entry.type === 'audio/mpeg') ||
+        alternatives[alternatives.length - 1]);
+    return [...manifest.entries, ...audio];
+}
+
+async function loadManifest() {
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(absoluteUrl(MANIFEST_URL));
+    if (cached) return cached.json();
+    const response = await fetch(MANIFEST_URL, { cache: 'no-store' });
+    await cache.put(absoluteUrl(MANIFEST_URL), response.clone());
+    return response.json();
+}
+
+// URL -> cache key, rebuilt whenever the worker is restarted
+function getPrecacheIndex() {
+    precacheIndex = precacheIndex || loadManifest().then(manifest =>
+        new Map(selectEntries(manifest).map(entry => [absoluteUrl(entry.url), cacheKey(entry)])));
+    return precacheIndex;
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const manifest = await loadManifest();
+        const cache = await caches.open(CACHE_NAME);
+        const present = new Set((await cache.keys()).map(request => request.url));
+        await Promise.all(selectEntries(manifest).map(async entry => {
+            // Unchanged since the last deploy: already cached under this revision
+            if (present.has(cacheKey(entry))) return;
+            const response = await fetch(entry.url, { cache: 'reload' });
+            if (!response.ok) throw new Error(`Precache failed: ${entry.url} (${response.status})`);
+            await cache.put(cacheKey(entry), response);
+        }));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        const index = await getPrecacheIndex();
+        const wanted = new Set([...index.values(), absoluteUrl(MANIFEST_URL)]);
+        const cache = await caches.open(CACHE_NAME);
+        const stale = (await cache.keys()).filter(request => !wanted.has(request.url));
+        await Promise.all(stale.map(request => cache.delete(request)));
+        await self.clients.claim();
+    })());
+});
+
+// Audio elements ask for byte ranges; answer them from the cached file
+async function rangeResponse(request, response) {
+    const range = /^bytes=(\d*)-(\d*)$/.exec(request.headers.get('range') || '');
+    if (!range || (!range[1] && !range[2])) return response;
+    const blob = await response.blob();
+    const start = range[1] ? Number(range[1]) : Math.max(0, blob.size - Number(range[2]));
+    const end = range[1] && range[2] ? Math.min(Number(range[2]), blob.size - 1) : blob.size - 1;
+    return new Response(blob.slice(start, end + 1), {
+        status: 206,
+        statusText: 'Partial Content',
+        headers: {
+            'Content-Type': response.headers.get('Content-Type') || '',
+            'Content-Range': `bytes ${start}-${end}/${blob.size}`,
+            'Content-Length': String(end - start + 1)
+        }
+    });
+}
+
+self.addEventListener('fetch', event => {
+    const { request } = event;
+    if (request.method !== 'GET' || !request.url.startsWith(self.registration.scope)) return;
+
+    event.respondWith((async () => {
+        const index = await getPrecacheIndex().catch(() => new Map());
+        const url = new URL(request.url);
+        url.search = '';
+        url.hash = '';
+        let key = index.get(url.href);
+        if (!key && request.mode === 'navigate') {
+            key = index.get(absoluteUrl('index.html'));
+        }
+        const cached = key && await caches.match(key);
+        return cached ? rangeResponse(request, cached) : fetch(request);
+    })());
+});